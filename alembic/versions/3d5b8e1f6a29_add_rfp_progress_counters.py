@@ -0,0 +1,30 @@
+"""add rfp progress counters
+
+Revision ID: 3d5b8e1f6a29
+Revises: e71a6c93f2d8
+Create Date: 2025-10-22 11:08:45.603917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d5b8e1f6a29'
+down_revision: Union[str, Sequence[str], None] = 'e71a6c93f2d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rfp_projects', sa.Column('questions_total', sa.Integer(), server_default='0', nullable=True))
+    op.add_column('rfp_projects', sa.Column('questions_processed', sa.Integer(), server_default='0', nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('rfp_projects', 'questions_processed')
+    op.drop_column('rfp_projects', 'questions_total')
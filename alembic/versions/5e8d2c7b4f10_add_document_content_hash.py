@@ -0,0 +1,33 @@
+"""add document content hash
+
+Revision ID: 5e8d2c7b4f10
+Revises: c6a1f7e2b985
+Create Date: 2025-10-23 15:26:51.730482
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8d2c7b4f10'
+down_revision: Union[str, Sequence[str], None] = 'c6a1f7e2b985'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Existing documents keep a NULL hash and are never matched as duplicates.
+    """
+    op.add_column('documents', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_documents_company_id_content_hash', 'documents', ['company_id', 'content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_documents_company_id_content_hash', table_name='documents')
+    op.drop_column('documents', 'content_hash')
@@ -0,0 +1,36 @@
+"""add vector_chunks hnsw index
+
+Revision ID: 8c3f1a2b7d41
+Revises: 55af1d54e09f
+Create Date: 2025-10-20 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f1a2b7d41'
+down_revision: Union[str, Sequence[str], None] = '55af1d54e09f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_vector_chunks_embedding_hnsw',
+        'vector_chunks',
+        ['embedding'],
+        unique=False,
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_vector_chunks_embedding_hnsw', table_name='vector_chunks')
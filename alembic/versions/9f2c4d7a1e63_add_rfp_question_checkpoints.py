@@ -0,0 +1,39 @@
+"""add rfp question checkpoints
+
+Revision ID: 9f2c4d7a1e63
+Revises: 3d5b8e1f6a29
+Create Date: 2025-10-22 16:41:19.274556
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f2c4d7a1e63'
+down_revision: Union[str, Sequence[str], None] = '3d5b8e1f6a29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+question_status = sa.Enum('PENDING', 'ANSWERED', 'FAILED', name='questionstatus')
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Rows written before checkpointing existed only ever held finished answers,
+    so they are backfilled as ANSWERED.
+    """
+    question_status.create(op.get_bind(), checkfirst=True)
+    op.add_column('rfp_questions', sa.Column('question_index', sa.Integer(), nullable=True))
+    op.add_column('rfp_questions', sa.Column('status', question_status, server_default='ANSWERED', nullable=True))
+    op.alter_column('rfp_questions', 'status', server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('rfp_questions', 'status')
+    op.drop_column('rfp_questions', 'question_index')
+    question_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,42 @@
+"""add vector_chunks search_vector
+
+Revision ID: b4e92d0c5a17
+Revises: 8c3f1a2b7d41
+Create Date: 2025-10-20 14:37:08.915204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e92d0c5a17'
+down_revision: Union[str, Sequence[str], None] = '8c3f1a2b7d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('vector_chunks', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', chunk_text)", persisted=True),
+        nullable=True
+    ))
+    op.create_index(
+        'ix_vector_chunks_search_vector',
+        'vector_chunks',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_vector_chunks_search_vector', table_name='vector_chunks')
+    op.drop_column('vector_chunks', 'search_vector')
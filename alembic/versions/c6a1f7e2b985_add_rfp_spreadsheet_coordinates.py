@@ -0,0 +1,32 @@
+"""add rfp spreadsheet coordinates
+
+Revision ID: c6a1f7e2b985
+Revises: 9f2c4d7a1e63
+Create Date: 2025-10-23 11:08:42.519307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6a1f7e2b985'
+down_revision: Union[str, Sequence[str], None] = '9f2c4d7a1e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rfp_projects', sa.Column('question_column', sa.String(), nullable=True))
+    op.add_column('rfp_questions', sa.Column('source_sheet', sa.String(), nullable=True))
+    op.add_column('rfp_questions', sa.Column('source_row', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('rfp_questions', 'source_row')
+    op.drop_column('rfp_questions', 'source_sheet')
+    op.drop_column('rfp_projects', 'question_column')
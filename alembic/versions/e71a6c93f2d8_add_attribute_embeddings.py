@@ -0,0 +1,35 @@
+"""add attribute embeddings
+
+Revision ID: e71a6c93f2d8
+Revises: b4e92d0c5a17
+Create Date: 2025-10-21 09:54:12.118340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import pgvector.sqlalchemy
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e71a6c93f2d8'
+down_revision: Union[str, Sequence[str], None] = 'b4e92d0c5a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Existing rows are left with a NULL embedding. The first attribute search
+    for each company schedules the backfill_attribute_embeddings task for them.
+    """
+    op.add_column('attributes', sa.Column('embedding', pgvector.sqlalchemy.vector.VECTOR(dim=1536), nullable=True))
+    op.create_index(op.f('ix_attributes_company_id'), 'attributes', ['company_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_attributes_company_id'), table_name='attributes')
+    op.drop_column('attributes', 'embedding')
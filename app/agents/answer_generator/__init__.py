@@ -1,18 +1,18 @@
-from app.agents.answer_generator.graph import create_answer_generator_graph
+from app.agents.answer_generator.graph import create_answer_generator_graph, answer_generator_graph
 from app.agents.answer_generator.state import AnswerGeneratorState
 from sqlalchemy.orm import Session
 from typing import Dict, Optional
 from uuid import UUID
 
 def generate_answer_for_question(question: str, db: Session, user_id: Optional[UUID] = None, company_id: Optional[UUID] = None) -> Dict:
-    graph = create_answer_generator_graph(db)
-    
     initial_state = {
         "user_id": user_id,
         "company_id": company_id,
         "question": question,
         "decomposed_queries": [],
+        "query_embeddings": {},
         "attribute_results": [],
+        "rag_candidates": [],
         "rag_results": [],
         "answer": "",
         "trust_score": 0.0,
@@ -20,7 +20,7 @@ def generate_answer_for_question(question: str, db: Session, user_id: Optional[U
         "source_type": "none"
     }
     
-    result = graph.invoke(initial_state)
+    result = answer_generator_graph.invoke(initial_state, config={"configurable": {"db": db}})
     
     return {
         "answer": result["answer"],
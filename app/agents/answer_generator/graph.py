@@ -1,25 +1,45 @@
 from langgraph.graph import StateGraph, END
-from sqlalchemy.orm import Session
 from app.agents.answer_generator.state import AnswerGeneratorState
 from app.agents.answer_generator.nodes.decompose import decompose_query_node
+from app.agents.answer_generator.nodes.embed import embed_queries_node
 from app.agents.answer_generator.nodes.search_attributes import search_attributes
-from app.agents.answer_generator.nodes.search import search_rag_node
-from app.agents.answer_generator.nodes.generate import generate_answer_node
+from app.agents.answer_generator.nodes.search import search_rag_node, rerank_node
+from app.agents.answer_generator.nodes.generate import generate_answer_node, has_high_confidence_attribute
 
-def create_answer_generator_graph(db: Session):
+def _join_searches(state: AnswerGeneratorState) -> dict:
+    return {}
+
+def _route_after_search(state: AnswerGeneratorState) -> str:
+    if has_high_confidence_attribute(state):
+        return "generate"
+    return "rerank"
+
+def create_answer_generator_graph():
     workflow = StateGraph(AnswerGeneratorState)
     
 
-    workflow.add_node("search_attributes", search_attributes)
     workflow.add_node("decompose", decompose_query_node)
-    workflow.add_node("search_rag", lambda state: search_rag_node(state, db))
+    workflow.add_node("embed", embed_queries_node)
+    workflow.add_node("search_attributes", search_attributes)
+    workflow.add_node("search_rag", search_rag_node)
+    workflow.add_node("join_searches", _join_searches)
+    workflow.add_node("rerank", rerank_node)
     workflow.add_node("generate", generate_answer_node)
     
  
-    workflow.set_entry_point("search_attributes")
-    workflow.add_edge("search_attributes", "decompose")
-    workflow.add_edge("decompose", "search_rag")
-    workflow.add_edge("search_rag", "generate")
+    workflow.set_entry_point("decompose")
+    workflow.add_edge("decompose", "embed")
+    workflow.add_edge("embed", "search_attributes")
+    workflow.add_edge("embed", "search_rag")
+    workflow.add_edge(["search_attributes", "search_rag"], "join_searches")
+    workflow.add_conditional_edges(
+        "join_searches",
+        _route_after_search,
+        {"generate": "generate", "rerank": "rerank"}
+    )
+    workflow.add_edge("rerank", "generate")
     workflow.add_edge("generate", END)
     
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile()
+
+answer_generator_graph = create_answer_generator_graph()
\ No newline at end of file
@@ -0,0 +1,19 @@
+from app.agents.answer_generator.state import AnswerGeneratorState
+from app.services.embedding_service import EmbeddingService
+import logging
+
+logger = logging.getLogger(__name__)
+
+def embed_queries_node(state: AnswerGeneratorState) -> AnswerGeneratorState:
+    if not state.get("company_id"):
+        state["query_embeddings"] = {}
+        return state
+    
+    texts = list(dict.fromkeys([state["question"]] + state.get("decomposed_queries", [])))
+    
+    embeddings = EmbeddingService.generate_embeddings(texts)
+    
+    state["query_embeddings"] = dict(zip(texts, embeddings))
+    logger.info(f"Embedded {len(texts)} queries in one batch")
+    
+    return state
\ No newline at end of file
@@ -8,12 +8,20 @@ import re
 
 logger = logging.getLogger(__name__)
 
+ATTRIBUTE_HIGH_CONFIDENCE = 0.75
+
+
+def has_high_confidence_attribute(state: AnswerGeneratorState) -> bool:
+    attribute_results = state.get("attribute_results", [])
+    return bool(attribute_results) and attribute_results[0]["similarity"] > ATTRIBUTE_HIGH_CONFIDENCE
+
+
 def generate_answer_node(state: AnswerGeneratorState) -> AnswerGeneratorState:
     attribute_results = state.get("attribute_results", [])
     rag_results = state.get("rag_results", [])
     question = state["question"]
     
-    if attribute_results and attribute_results[0]["similarity"] > 0.75:
+    if has_high_confidence_attribute(state):
         return _generate_from_attribute(state, attribute_results)
     
     if rag_results and rag_results[0].get("rerank_score", 0) >= 0.05:
@@ -1,19 +1,33 @@
-from sqlalchemy.orm import Session
+from langchain_core.runnables import RunnableConfig
 from app.agents.answer_generator.state import AnswerGeneratorState
 from app.services.rag_service import RAGService
+from typing import Dict
 
-def search_rag_node(state: AnswerGeneratorState, db: Session) -> AnswerGeneratorState:
+def search_rag_node(state: AnswerGeneratorState, config: RunnableConfig) -> Dict:
     company_id = state.get("company_id")
     
     if not company_id:
-        state["rag_results"] = []
-        return state
+        return {"rag_candidates": []}
     
-    all_results = []
+    db = config["configurable"]["db"]
+    all_candidates = []
     
     for query in state["decomposed_queries"]:
-        results = RAGService.search_similar_chunks(query, db, company_id, top_k=3)
+        candidates = RAGService.retrieve_candidates(
+            query, db, company_id, top_k=3,
+            query_embedding=state.get("query_embeddings", {}).get(query)
+        )
+        if candidates:
+            all_candidates.append({"query": query, "candidates": candidates})
+    
+    return {"rag_candidates": all_candidates}
+
+
+def rerank_node(state: AnswerGeneratorState) -> Dict:
+    all_results = []
+    
+    for entry in state.get("rag_candidates", []):
+        results = RAGService.rerank(entry["query"], entry["candidates"], top_k=3)
         all_results.extend(results)
     
-    state["rag_results"] = all_results
-    return state
\ No newline at end of file
+    return {"rag_results": all_results}
\ No newline at end of file
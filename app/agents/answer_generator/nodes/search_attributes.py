@@ -1,26 +1,27 @@
 from app.agents.answer_generator.state import AnswerGeneratorState
 from app.services.attribute_search import AttributeSearchService
 from app.core.database import SessionLocal
+from typing import Dict
 
-def search_attributes(state: AnswerGeneratorState) -> AnswerGeneratorState:
+def search_attributes(state: AnswerGeneratorState) -> Dict:
     db = SessionLocal()
     
     try:
         company_id = state.get("company_id")
         if not company_id:
-            state["attribute_results"] = []
-            return state
+            return {"attribute_results": []}
         
         query = state["question"]
         
-        results = AttributeSearchService.search_attributes(query, company_id, db, top_k=3)
+        results = AttributeSearchService.search_attributes(
+            query, company_id, db, top_k=3,
+            query_embedding=state.get("query_embeddings", {}).get(query)
+        )
         
         print(f"Attribute search for: {query}")
         print(f"Top result: {results[0] if results else 'None'}")
         
-        state["attribute_results"] = results
-        
-        return state
+        return {"attribute_results": results}
         
     finally:
         db.close()
\ No newline at end of file
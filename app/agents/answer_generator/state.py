@@ -6,7 +6,9 @@ class AnswerGeneratorState(TypedDict):
     company_id: Optional[UUID]
     question: str
     decomposed_queries: List[str]
+    query_embeddings: Dict[str, List[float]]
     attribute_results: List[Dict]
+    rag_candidates: List[Dict]
     rag_results: List[Dict]
     answer: str
     trust_score: float
@@ -1,23 +1,26 @@
-from app.agents.kb_manager.graph import create_kb_manager_graph
+from app.agents.kb_manager.graph import create_kb_manager_graph, kb_manager_graph
+from app.agents.kb_manager.coordinator import run_coalesced
 from app.agents.kb_manager.state import KBManagerState
 from typing import List, Dict
 from uuid import UUID
 
 def run_kb_manager(user_id: str, company_id: UUID, new_attributes: List[Dict]) -> Dict:
-    graph = create_kb_manager_graph()
-    
+    return run_coalesced(user_id, company_id, new_attributes, _run_graph)
+
+def _run_graph(user_id: str, company_id: UUID, new_attributes: List[Dict]) -> Dict:
     initial_state = {
         "user_id": user_id,
         "company_id": company_id,
         "new_attributes": new_attributes,
         "existing_attributes": [],
+        "kb_version": None,
         "conflicts": [],
         "resolutions": [],
         "processed_keys": set(),
         "stats": {}
     }
     
-    result = graph.invoke(initial_state)
+    result = kb_manager_graph.invoke(initial_state)
     
     return result["stats"]
 
@@ -0,0 +1,139 @@
+from app.core.config import get_settings
+from app.core.redis_client import get_redis
+from redis.exceptions import LockError
+from typing import Callable, Dict, List, Tuple
+from uuid import UUID
+import json
+import logging
+import threading
+import uuid
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "kb_pending:{company_id}"
+PROCESSING_KEY = "kb_processing:{company_id}"
+LOCK_KEY = "kb_lock:{company_id}"
+COALESCED_STATS = {"coalesced": True, "new_added": 0}
+
+def run_coalesced(user_id: str, company_id: UUID, new_attributes: List[Dict], run_pass: Callable[[str, UUID, List[Dict]], Dict]) -> Dict:
+    payload_id = str(uuid.uuid4())
+    payload = json.dumps({"id": payload_id, "user_id": user_id, "new_attributes": new_attributes}, default=str)
+    pending_key = PENDING_KEY.format(company_id=company_id)
+    processing_key = PROCESSING_KEY.format(company_id=company_id)
+    
+    try:
+        redis_client = get_redis()
+        redis_client.rpush(pending_key, payload)
+    except Exception as e:
+        logger.warning(f"KB coordination unavailable for company {company_id}, running uncoordinated: {str(e)}")
+        return run_pass(user_id, company_id, new_attributes)
+    
+    lock = redis_client.lock(
+        LOCK_KEY.format(company_id=company_id),
+        timeout=settings.KB_MANAGER_LOCK_TIMEOUT_SECONDS,
+        blocking_timeout=settings.KB_MANAGER_LOCK_WAIT_SECONDS,
+        thread_local=False
+    )
+    
+    try:
+        acquired = lock.acquire()
+    except Exception as e:
+        logger.warning(f"Could not acquire KB lock of company {company_id}: {str(e)}")
+        acquired = False
+    
+    if not acquired:
+        if not _withdraw_pending(redis_client, pending_key, payload):
+            logger.info(f"Attributes for company {company_id} were already taken by a concurrent KB manager pass")
+            return dict(COALESCED_STATS)
+        
+        logger.warning(f"Timed out waiting for KB lock of company {company_id}, running uncoordinated")
+        return run_pass(user_id, company_id, new_attributes)
+    
+    stop_heartbeat = threading.Event()
+    heartbeat = threading.Thread(target=_keep_lock, args=(lock, company_id, stop_heartbeat), daemon=True)
+    heartbeat.start()
+    
+    try:
+        claimed = _claim_pending(redis_client, pending_key, processing_key)
+        
+        if payload_id not in {item["id"] for _, item in claimed}:
+            logger.info(f"Attributes for company {company_id} were merged into a concurrent KB manager pass")
+            return dict(COALESCED_STATS)
+        
+        try:
+            stats = _run_claimed(redis_client, processing_key, company_id, claimed, run_pass)
+        except Exception:
+            redis_client.lrem(processing_key, 1, payload)
+            raise
+        
+        if "error" in stats:
+            redis_client.lrem(processing_key, 1, payload)
+        
+        return stats
+    
+    finally:
+        stop_heartbeat.set()
+        heartbeat.join()
+        try:
+            lock.release()
+        except LockError as e:
+            logger.warning(f"KB lock of company {company_id} expired before release: {str(e)}")
+
+
+def _run_claimed(redis_client, processing_key: str, company_id: UUID, claimed: List[Tuple[str, Dict]], run_pass: Callable[[str, UUID, List[Dict]], Dict]) -> Dict:
+    by_user = {}
+    for raw, item in claimed:
+        by_user.setdefault(item["user_id"], []).append((raw, item))
+    
+    total = sum(len(item["new_attributes"]) for _, item in claimed)
+    logger.info(f"Running KB manager for company {company_id} on {total} attributes from {len(claimed)} documents")
+    
+    stats = {}
+    for user_id, items in by_user.items():
+        new_attributes = [attr for _, item in items for attr in item["new_attributes"]]
+        user_stats = run_pass(user_id, company_id, new_attributes)
+        
+        if "error" in user_stats:
+            logger.error(f"KB manager pass for company {company_id} failed, leaving {len(claimed)} documents queued: {user_stats['error']}")
+            return {**stats, **user_stats, "documents_coalesced": len(claimed)}
+        
+        pipeline = redis_client.pipeline(transaction=False)
+        for raw, _ in items:
+            pipeline.lrem(processing_key, 1, raw)
+        pipeline.execute()
+        
+        for key, value in user_stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                stats[key] = stats.get(key, 0) + value
+            else:
+                stats[key] = value
+    
+    stats["documents_coalesced"] = len(claimed)
+    return stats
+
+
+def _claim_pending(redis_client, pending_key: str, processing_key: str) -> List[Tuple[str, Dict]]:
+    while redis_client.lmove(pending_key, processing_key, "LEFT", "RIGHT") is not None:
+        pass
+    
+    return [(raw, json.loads(raw)) for raw in redis_client.lrange(processing_key, 0, -1)]
+
+
+def _keep_lock(lock, company_id: UUID, stop: threading.Event):
+    interval = max(1, settings.KB_MANAGER_LOCK_TIMEOUT_SECONDS // 3)
+    
+    while not stop.wait(interval):
+        try:
+            lock.reacquire()
+        except Exception as e:
+            logger.error(f"Lost KB lock of company {company_id} during a KB manager pass: {str(e)}")
+            return
+
+
+def _withdraw_pending(redis_client, pending_key: str, payload: str) -> bool:
+    try:
+        return redis_client.lrem(pending_key, 1, payload) > 0
+    except Exception as e:
+        logger.warning(f"Could not remove pending KB attributes from {pending_key}: {str(e)}")
+        return True
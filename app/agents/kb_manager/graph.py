@@ -19,4 +19,6 @@ def create_kb_manager_graph():
     workflow.add_edge("resolve_conflicts", "save_attributes")
     workflow.add_edge("save_attributes", END)
     
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile()
+
+kb_manager_graph = create_kb_manager_graph()
\ No newline at end of file
@@ -1,9 +1,14 @@
 from app.agents.kb_manager.state import KBManagerState
+from collections import Counter
 from difflib import SequenceMatcher
-from typing import List, Dict
+from typing import List, Dict, Set, Tuple
+
+KEY_SIMILARITY_THRESHOLD = 0.75
 
 def find_conflicts(state: KBManagerState) -> KBManagerState:
     deduplicated_new = _deduplicate_new_attributes(state["new_attributes"])
+    existing_attributes = state["existing_attributes"]
+    key_index = _build_key_index(existing_attributes)
     
     conflicts = []
     processed_new_keys = set()
@@ -12,13 +17,14 @@ def find_conflicts(state: KBManagerState) -> KBManagerState:
         best_match = None
         best_score = 0
         
-        for existing_attr in state["existing_attributes"]:
+        for i in _candidate_indices(new_attr["key"], key_index):
+            existing_attr = existing_attributes[i]
             key_similarity = _calculate_key_similarity(
                 new_attr["key"], 
                 existing_attr["key"]
             )
             
-            if key_similarity > 0.75:
+            if key_similarity > KEY_SIMILARITY_THRESHOLD:
                 value_similarity = _calculate_value_similarity(
                     new_attr["value"],
                     existing_attr["value"]
@@ -75,6 +81,62 @@ def _deduplicate_new_attributes(attributes: List[Dict]) -> List[Dict]:
     return list(seen.values())
 
 
+def _build_key_index(attributes: List[Dict]) -> Dict:
+    exact = {}
+    bigrams = {}
+    lowered = []
+    
+    for i, attr in enumerate(attributes):
+        lowered.append(attr["key"].lower().strip())
+        exact.setdefault(_normalize_key(attr["key"]), []).append(i)
+        
+        for bigram in _key_bigrams(attr["key"]):
+            bigrams.setdefault(bigram, []).append(i)
+    
+    return {"exact": exact, "bigrams": bigrams, "lowered": lowered}
+
+
+def _candidate_indices(key: str, key_index: Dict) -> List[int]:
+    candidates = set(key_index["exact"].get(_normalize_key(key), []))
+    
+    shared = Counter()
+    for bigram in _key_bigrams(key):
+        shared.update(key_index["bigrams"].get(bigram, []))
+    
+    # Each unmatched character of a SequenceMatcher alignment breaks at most two
+    # padded bigrams on its own side and one on the other, so a ratio above the
+    # threshold guarantees 2 * shared > (3 * threshold - 2) * (len_a + len_b) + 2.
+    lowered = key_index["lowered"]
+    key_lower = key.lower().strip()
+    matcher = SequenceMatcher(None, key_lower)
+    for i, count in shared.items():
+        if i in candidates or 2 * count < (3 * KEY_SIMILARITY_THRESHOLD - 2) * (len(key_lower) + len(lowered[i])) + 2:
+            continue
+        
+        matcher.set_seq2(lowered[i])
+        if matcher.real_quick_ratio() > KEY_SIMILARITY_THRESHOLD and matcher.quick_ratio() > KEY_SIMILARITY_THRESHOLD:
+            candidates.add(i)
+    
+    return sorted(candidates)
+
+
+def _normalize_key(key: str) -> str:
+    return ''.join(c for c in key.lower().strip() if c.isalnum())
+
+
+def _key_bigrams(key: str) -> Set[Tuple[str, int]]:
+    padded = f" {key.lower().strip()} "
+    occurrences = Counter()
+    bigrams = set()
+    
+    for i in range(len(padded) - 1):
+        bigram = padded[i:i + 2]
+        occurrences[bigram] += 1
+        bigrams.add((bigram, occurrences[bigram]))
+    
+    return bigrams
+
+
 def _calculate_key_similarity(key1: str, key2: str) -> float:
     key1_lower = key1.lower().strip()
     key2_lower = key2.lower().strip()
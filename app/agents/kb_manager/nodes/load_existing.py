@@ -1,8 +1,21 @@
 from app.agents.kb_manager.state import KBManagerState
 from app.core.database import SessionLocal
 from app.models.attribute import Attribute
+from app.services.attribute_snapshot import attribute_snapshot_cache
+import logging
+
+logger = logging.getLogger(__name__)
 
 def load_existing_attributes(state: KBManagerState) -> KBManagerState:
+    version = attribute_snapshot_cache.current_version(state["company_id"])
+    state["kb_version"] = version
+    
+    snapshot = attribute_snapshot_cache.get(state["company_id"], state.get("user_id"), version)
+    if snapshot is not None:
+        logger.info(f"Reusing KB snapshot for company {state['company_id']} at version {version}: {len(snapshot)} attributes")
+        state["existing_attributes"] = snapshot
+        return state
+    
     db = SessionLocal()
     try:
         query = db.query(Attribute).filter(
@@ -25,6 +38,8 @@ def load_existing_attributes(state: KBManagerState) -> KBManagerState:
             for attr in existing
         ]
         
+        attribute_snapshot_cache.put(state["company_id"], state.get("user_id"), version, state["existing_attributes"])
+        
         return state
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -1,19 +1,29 @@
 from app.agents.kb_manager.state import KBManagerState
 from app.services.llm_factory import LLMFactory
-from app.prompts.kb_manager import CONFLICT_RESOLUTION_SYSTEM, CONFLICT_RESOLUTION_USER
+from app.prompts.kb_manager import (
+    CONFLICT_RESOLUTION_SYSTEM,
+    CONFLICT_RESOLUTION_USER,
+    CONFLICT_RESOLUTION_BATCH_USER,
+    CONFLICT_RESOLUTION_BATCH_ITEM
+)
 from langchain_core.messages import SystemMessage, HumanMessage
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+LLM_BATCH_SIZE = 8
+LLM_CONCURRENCY = 4
+
 def resolve_conflicts(state: KBManagerState) -> KBManagerState:
     if not state["conflicts"]:
         state["resolutions"] = []
         return state
     
     resolutions = []
+    llm_positions = []
     
     for conflict in state["conflicts"]:
         conflict_type = conflict.get("conflict_type", "ambiguous")
@@ -23,10 +33,18 @@ def resolve_conflicts(state: KBManagerState) -> KBManagerState:
         elif conflict_type == "update":
             resolution = _resolve_update(conflict)
         else:
-            resolution = _resolve_with_llm(conflict)
+            resolution = None
+            llm_positions.append(len(resolutions))
         
         resolutions.append(resolution)
     
+    if llm_positions:
+        llm_conflicts = [state["conflicts"][i] for i in llm_positions]
+        llm_resolutions = _resolve_all_with_llm(llm_conflicts)
+        
+        for i, resolution in zip(llm_positions, llm_resolutions):
+            resolutions[i] = resolution
+    
     state["resolutions"] = resolutions
     return state
 
@@ -65,6 +83,72 @@ def _resolve_update(conflict: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+def _resolve_all_with_llm(conflicts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    batches = [conflicts[i:i + LLM_BATCH_SIZE] for i in range(0, len(conflicts), LLM_BATCH_SIZE)]
+    logger.info(f"Resolving {len(conflicts)} conflicts with LLM in {len(batches)} batches")
+    
+    with ThreadPoolExecutor(max_workers=min(LLM_CONCURRENCY, len(batches))) as executor:
+        results = list(executor.map(_resolve_batch_with_llm, batches))
+    
+    return [resolution for batch in results for resolution in batch]
+
+
+def _resolve_batch_with_llm(conflicts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if len(conflicts) == 1:
+        return [_resolve_with_llm(conflicts[0])]
+    
+    try:
+        llm = LLMFactory.get_llm("gpt-4o-mini")
+        
+        items = "\n\n".join(
+            CONFLICT_RESOLUTION_BATCH_ITEM.format(
+                id=i,
+                existing_key=conflict["existing"]["key"],
+                existing_value=conflict["existing"]["value"],
+                existing_date=conflict["existing"].get("last_updated", "Unknown"),
+                new_key=conflict["new"]["key"],
+                new_value=conflict["new"]["value"]
+            )
+            for i, conflict in enumerate(conflicts, start=1)
+        )
+        
+        response = llm.invoke(
+            [
+                SystemMessage(content=CONFLICT_RESOLUTION_SYSTEM),
+                HumanMessage(content=CONFLICT_RESOLUTION_BATCH_USER.format(conflicts=items))
+            ],
+            response_format={"type": "json_object"}
+        )
+        
+        by_id = {}
+        for item in json.loads(response.content).get("resolutions", []):
+            if isinstance(item, dict) and "id" in item:
+                by_id[str(item["id"])] = item
+        
+    except Exception as e:
+        logger.error(f"LLM batch resolution error: {str(e)}")
+        return [_get_fallback_resolution(conflict) for conflict in conflicts]
+    
+    resolutions = []
+    for i, conflict in enumerate(conflicts, start=1):
+        resolution = by_id.get(str(i))
+        
+        if not _validate_resolution(resolution):
+            logger.warning(f"Invalid LLM resolution for {conflict['new']['key']}, defaulting to keep_existing")
+            resolutions.append(_get_fallback_resolution(conflict))
+            continue
+        
+        resolutions.append({
+            "conflict": conflict,
+            "decision": resolution["decision"],
+            "reason": resolution.get("reason", ""),
+            "merged_value": resolution.get("merged_value"),
+            "method": "llm"
+        })
+    
+    return resolutions
+
+
 def _resolve_with_llm(conflict: Dict[str, Any]) -> Dict[str, Any]:
     try:
         llm = LLMFactory.get_llm("gpt-4o-mini")
@@ -1,9 +1,17 @@
 from app.agents.kb_manager.state import KBManagerState
 from app.core.database import SessionLocal
 from app.models.attribute import Attribute
+from app.services.attribute_search import AttributeSearchService
+from app.services.attribute_snapshot import attribute_snapshot_cache
+from sqlalchemy import String, cast, column, func, insert, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from pgvector.sqlalchemy import Vector
+from sqlalchemy.orm import Session
+from typing import Dict, List
 from uuid import UUID
 from datetime import datetime
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +28,8 @@ def save_attributes(state: KBManagerState) -> KBManagerState:
         }
         
         resolved_keys = set()
+        updates = {}
+        inserts = []
         
         for resolution in state["resolutions"]:
             conflict = resolution["conflict"]
@@ -34,27 +44,13 @@ def save_attributes(state: KBManagerState) -> KBManagerState:
                 logger.info(f"Kept existing: {existing_attr['key']}")
                 
             elif decision == "keep_new":
-                attr = db.query(Attribute).filter(
-                    Attribute.id == UUID(existing_attr["id"])
-                ).first()
-                if attr:
-                    attr.value = new_attr["value"]
-                    attr.last_updated = datetime.utcnow()
-                    if new_attr.get("source_doc_id"):
-                        attr.source_doc_id = UUID(new_attr["source_doc_id"])
+                updates[existing_attr["id"]] = _updated_attribute(existing_attr, new_attr, new_attr["value"])
                 stats["kept_new"] += 1
                 logger.info(f"Updated to new: {new_attr['key']}")
                 
             elif decision == "merge_both":
-                attr = db.query(Attribute).filter(
-                    Attribute.id == UUID(existing_attr["id"])
-                ).first()
-                if attr:
-                    merged_value = resolution.get("merged_value", new_attr["value"])
-                    attr.value = merged_value
-                    attr.last_updated = datetime.utcnow()
-                    if new_attr.get("source_doc_id"):
-                        attr.source_doc_id = UUID(new_attr["source_doc_id"])
+                merged_value = resolution.get("merged_value", new_attr["value"])
+                updates[existing_attr["id"]] = _updated_attribute(existing_attr, new_attr, merged_value)
                 stats["merged"] += 1
                 logger.info(f"Merged: {new_attr['key']}")
         
@@ -62,20 +58,38 @@ def save_attributes(state: KBManagerState) -> KBManagerState:
             key_category_pair = (new_attr["key"].lower(), new_attr["category"])
             
             if key_category_pair not in resolved_keys:
-                attr = Attribute(
+                inserts.append(Attribute(
+                    id=uuid.uuid4(),
                     user_id=state["user_id"],
                     company_id=state["company_id"],
                     key=new_attr["key"],
                     value=new_attr["value"],
                     category=new_attr["category"],
                     source_doc_id=UUID(new_attr["source_doc_id"]) if new_attr.get("source_doc_id") else None
-                )
-                db.add(attr)
+                ))
                 stats["new_added"] += 1
                 logger.info(f"Added new: {new_attr['key']}")
         
+        embedded = AttributeSearchService.embed_attributes(list(updates.values()) + inserts)
+        
+        updated_at = datetime.utcnow()
+        _bulk_update(db, list(updates.values()), updated_at)
+        _bulk_insert(db, inserts, updated_at)
+        
         db.commit()
         
+        if (updates or inserts) and not embedded:
+            AttributeSearchService.schedule_backfill(state["company_id"])
+        
+        if updates or inserts:
+            attribute_snapshot_cache.apply_writes(
+                state["company_id"],
+                state.get("user_id"),
+                state.get("kb_version"),
+                {attr_id: {"value": attr.value, "last_updated": updated_at.isoformat()} for attr_id, attr in updates.items()},
+                [_snapshot_entry(attr, updated_at) for attr in inserts]
+            )
+        
         state["stats"] = stats
         logger.info(f"KB Manager stats: {stats}")
         
@@ -88,4 +102,68 @@ def save_attributes(state: KBManagerState) -> KBManagerState:
         return state
         
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def _updated_attribute(existing_attr: Dict, new_attr: Dict, value: str) -> Attribute:
+    return Attribute(
+        id=UUID(existing_attr["id"]),
+        key=existing_attr["key"],
+        value=value,
+        source_doc_id=UUID(new_attr["source_doc_id"]) if new_attr.get("source_doc_id") else None
+    )
+
+
+def _bulk_update(db: Session, attributes: List[Attribute], updated_at: datetime) -> None:
+    if not attributes:
+        return
+    
+    rows = values(
+        column("id", PGUUID(as_uuid=True)),
+        column("value", String),
+        column("source_doc_id", PGUUID(as_uuid=True)),
+        column("embedding", Vector(1536)),
+        name="updated"
+    ).data([(attr.id, attr.value, attr.source_doc_id, attr.embedding) for attr in attributes])
+    
+    db.execute(
+        update(Attribute)
+        .where(Attribute.id == cast(rows.c.id, PGUUID(as_uuid=True)))
+        .values(
+            value=rows.c.value,
+            source_doc_id=func.coalesce(cast(rows.c.source_doc_id, PGUUID(as_uuid=True)), Attribute.source_doc_id),
+            embedding=cast(rows.c.embedding, Vector(1536)),
+            last_updated=updated_at
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _bulk_insert(db: Session, attributes: List[Attribute], updated_at: datetime) -> None:
+    if not attributes:
+        return
+    
+    db.execute(insert(Attribute), [
+        {
+            "id": attr.id,
+            "user_id": attr.user_id,
+            "company_id": attr.company_id,
+            "key": attr.key,
+            "value": attr.value,
+            "category": attr.category,
+            "source_doc_id": attr.source_doc_id,
+            "embedding": attr.embedding,
+            "last_updated": updated_at
+        }
+        for attr in attributes
+    ])
+
+
+def _snapshot_entry(attr: Attribute, updated_at: datetime) -> Dict:
+    return {
+        "id": str(attr.id),
+        "key": attr.key,
+        "value": attr.value,
+        "category": attr.category,
+        "last_updated": updated_at.isoformat()
+    }
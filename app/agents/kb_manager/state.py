@@ -1,4 +1,4 @@
-from typing import TypedDict, List, Dict, Set
+from typing import TypedDict, List, Dict, Set, Optional
 from uuid import UUID
 
 class KBManagerState(TypedDict):
@@ -6,6 +6,7 @@ class KBManagerState(TypedDict):
     company_id: UUID
     new_attributes: List[Dict]
     existing_attributes: List[Dict]
+    kb_version: Optional[int]
     conflicts: List[Dict]
     resolutions: List[Dict]
     processed_keys: Set[str]
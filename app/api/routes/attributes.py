@@ -5,6 +5,8 @@ from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.attribute import Attribute
 from app.api.schemas.attribute import AttributeResponse, AttributeUpdate, AttributeCreate
+from app.services.attribute_search import AttributeSearchService
+from app.services.attribute_snapshot import attribute_snapshot_cache
 from uuid import UUID
 import uuid
 
@@ -50,9 +52,15 @@ def create_attribute(
         category=data.category
     )
     
+    embedded = AttributeSearchService.embed_attributes([attribute])
+    
     db.add(attribute)
     db.commit()
     db.refresh(attribute)
+    attribute_snapshot_cache.invalidate(company_id)
+    
+    if not embedded:
+        AttributeSearchService.schedule_backfill(company_id)
     
     return attribute
 
@@ -98,8 +106,16 @@ def update_attribute(
     if data.category is not None:
         attribute.category = data.category
     
+    embedded = True
+    if data.key is not None or data.value is not None:
+        embedded = AttributeSearchService.embed_attributes([attribute])
+    
     db.commit()
     db.refresh(attribute)
+    attribute_snapshot_cache.invalidate(company_id)
+    
+    if not embedded:
+        AttributeSearchService.schedule_backfill(company_id)
     
     return attribute
 
@@ -121,5 +137,6 @@ def delete_attribute(
     
     db.delete(attribute)
     db.commit()
+    attribute_snapshot_cache.invalidate(company_id)
     
     return {"success": True, "message": "Attribute deleted"}
\ No newline at end of file
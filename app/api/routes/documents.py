@@ -8,6 +8,8 @@ from app.models.document import Document, DocType, ProcessingStatus
 from app.api.schemas.document import DocumentResponse, JobStatusResponse
 from app.services.storage import StorageService
 from app.services.usage_service import UsageService
+from app.services.rag_service import RAGService
+from app.services.document_dedup import DocumentDeduplicator
 import uuid
 from datetime import datetime
 from app.workers.tasks import process_document_task
@@ -61,7 +63,13 @@ async def upload_document(
                 })
                 continue
             
-            file_url = StorageService.upload_file(file_content, file.filename)
+            content_hash = DocumentDeduplicator.content_hash(file_content)
+            duplicate = DocumentDeduplicator.find_completed_duplicate(db, company_id, content_hash)
+            
+            if duplicate:
+                file_url = duplicate.file_url
+            else:
+                file_url = StorageService.upload_file(file_content, file.filename)
             
             tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()]
             
@@ -70,9 +78,10 @@ async def upload_document(
                 company_id=company_id,
                 filename=file.filename,
                 file_url=file_url,
+                content_hash=content_hash,
                 doc_type=doc_type.upper(),
                 tags=tag_list,
-                processing_status=ProcessingStatus.PENDING
+                processing_status=ProcessingStatus.COMPLETED if duplicate else ProcessingStatus.PENDING
             )
             
             db.add(document)
@@ -80,7 +89,12 @@ async def upload_document(
             
             usage_service.increment_doc_usage(str(company_id))
             
-            process_document_task.delay(str(document.id))
+            if duplicate:
+                DocumentDeduplicator.clone_chunks(db, duplicate, document)
+                db.commit()
+                RAGService.invalidate_company_index(company_id)
+            else:
+                process_document_task.delay(str(document.id))
             
             uploaded_docs.append({
                 "filename": file.filename,
@@ -152,9 +166,16 @@ def delete_document(
     if not document:
         raise APIError(status_code=404, message="Document not found")
     
-    StorageService.delete_file(document.file_url)
+    shared_file = db.query(Document).filter(
+        Document.file_url == document.file_url,
+        Document.id != document.id
+    ).first()
+    
+    if not shared_file:
+        StorageService.delete_file(document.file_url)
     db.delete(document)
     db.commit()
+    RAGService.invalidate_company_index(company_id)
     
     return {"success": True, "message": "Document deleted"}
 
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.rfp_project import RFPProject, RFPStatus
@@ -26,6 +26,7 @@ router = APIRouter(prefix="/api/rfps", tags=["rfps"])
 async def upload_rfp(
     file: UploadFile = File(...),
     rfp_name: str = Form(...),
+    question_column: Optional[str] = Form(None),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -49,6 +50,7 @@ async def upload_rfp(
         company_id=company_id,
         rfp_name=rfp_name,
         rfp_file_url=file_url,
+        question_column=question_column,
         status=RFPStatus.PENDING
     )
     
@@ -206,7 +208,7 @@ def export_rfp(
     
     questions = db.query(RFPQuestion).filter(
         RFPQuestion.project_id == rfp_id
-    ).order_by(RFPQuestion.created_at).all()
+    ).order_by(RFPQuestion.question_index, RFPQuestion.created_at).all()
     
     if not questions:
         raise HTTPException(status_code=400, detail="No questions found for this RFP")
@@ -10,6 +10,9 @@ class RFPQuestionResponse(BaseModel):
     answer_text: Optional[str]
     trust_score: float
     source_type: Optional[str]
+    status: Optional[str] = None
+    source_sheet: Optional[str] = None
+    source_row: Optional[int] = None
     user_edited: bool
     created_at: datetime
     updated_at: datetime
@@ -22,7 +25,10 @@ class RFPProjectResponse(BaseModel):
     user_id: str
     rfp_name: str
     rfp_file_url: str
+    question_column: Optional[str] = None
     status: str
+    questions_total: Optional[int] = 0
+    questions_processed: Optional[int] = 0
     created_at: datetime
     updated_at: datetime
     questions: Optional[List[RFPQuestionResponse]] = []
@@ -28,6 +28,33 @@ class Settings(BaseSettings):
     COHERE_API_KEY: str
     TAVILY_API_KEY: str
     
+    VECTOR_SEARCH_BACKEND: str = "pgvector"
+    VECTOR_SEARCH_EF_SEARCH: int = 100
+    VECTOR_SEARCH_ITERATIVE_SCAN: str = "strict_order"
+    RAG_INDEX_CACHE_MAX_MB: int = 512
+    KB_SNAPSHOT_CACHE_MAX_COMPANIES: int = 32
+    KB_SNAPSHOT_MAX_AGE_SECONDS: int = 600
+    KB_MANAGER_LOCK_TIMEOUT_SECONDS: int = 900
+    KB_MANAGER_LOCK_WAIT_SECONDS: int = 1800
+    
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_MB: int = 64
+    EMBEDDING_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    EMBEDDING_BATCH_MAX_TOKENS: int = 100000
+    EMBEDDING_BATCH_MAX_INPUTS: int = 512
+    EMBEDDING_CONCURRENCY: int = 4
+    EMBEDDING_MAX_RETRIES: int = 5
+    EMBEDDING_RETRY_BASE_DELAY: float = 1.0
+    
+    PDF_EXTRACTION_MAX_WORKERS: int = 0
+    
+    RFP_EXECUTION_MODE: str = "local"
+    RFP_QUESTION_BATCH_SIZE: int = 10
+    RFP_QUESTION_CONCURRENCY: int = 5
+    RFP_SAVE_BATCH_SIZE: int = 10
+    RFP_MAX_RETRIES: int = 3
+    RFP_RETRY_DELAY_SECONDS: int = 60
+    
     LANGCHAIN_API_KEY: str
     LANGCHAIN_TRACING_V2: str = "true"
     LANGCHAIN_PROJECT: str = "rfp-generator"
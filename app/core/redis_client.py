@@ -0,0 +1,9 @@
+from functools import lru_cache
+from app.core.config import get_settings
+import redis
+
+settings = get_settings()
+
+@lru_cache()
+def get_redis() -> redis.Redis:
+    return redis.Redis.from_url(settings.REDIS_URL)
\ No newline at end of file
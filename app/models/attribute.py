@@ -1,6 +1,7 @@
 from sqlalchemy import Column, String, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from pgvector.sqlalchemy import Vector
 from app.core.database import Base
 from datetime import datetime
 import uuid
@@ -10,11 +11,12 @@ class Attribute(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(String, nullable=False)
-    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False)
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False, index=True)
     key = Column(String, nullable=False)
     value = Column(String, nullable=False)
     category = Column(String)
     source_doc_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"))
+    embedding = Column(Vector(1536))
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     company = relationship("Company", back_populates="attributes")
\ No newline at end of file
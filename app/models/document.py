@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ARRAY, ForeignKey
+from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ARRAY, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -21,12 +21,16 @@ class ProcessingStatus(str, enum.Enum):
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_company_id_content_hash", "company_id", "content_hash"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(String, nullable=False)
     company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False)
     filename = Column(String, nullable=False)
     file_url = Column(String, nullable=False)
+    content_hash = Column(String(64))
     doc_type = Column(SQLEnum(DocType), nullable=False)
     tags = Column(ARRAY(String), default=[])
     uploaded_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, String, DateTime, Integer, Enum as SQLEnum, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -20,9 +20,12 @@ class RFPProject(Base):
     company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False)
     rfp_name = Column(String, nullable=False)
     rfp_file_url = Column(String, nullable=False)
+    question_column = Column(String)
     status = Column(SQLEnum(RFPStatus), default=RFPStatus.PENDING)
+    questions_total = Column(Integer, default=0, server_default="0")
+    questions_processed = Column(Integer, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    questions = relationship("RFPQuestion", back_populates="project", cascade="all, delete-orphan")
+    questions = relationship("RFPQuestion", back_populates="project", cascade="all, delete-orphan", order_by="RFPQuestion.question_index")
     company = relationship("Company", back_populates="rfp_projects")
\ No newline at end of file
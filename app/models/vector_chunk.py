@@ -1,12 +1,26 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, Index, Computed
+from sqlalchemy.dialects.postgresql import UUID, JSON, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from pgvector.sqlalchemy import Vector
 from app.core.database import Base
 import uuid
 
 class VectorChunk(Base):
     __tablename__ = "vector_chunks"
+    __table_args__ = (
+        Index(
+            "ix_vector_chunks_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"}
+        ),
+        Index(
+            "ix_vector_chunks_search_vector",
+            "search_vector",
+            postgresql_using="gin"
+        ),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     doc_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False, index=True)
@@ -14,5 +28,6 @@ class VectorChunk(Base):
     embedding = Column(Vector(1536))
     chunk_index = Column(Integer, nullable=False)
     chunk_metadata = Column(JSON, default={})
+    search_vector = deferred(Column(TSVECTOR, Computed("to_tsvector('english', chunk_text)", persisted=True)))
     
     document = relationship("Document", back_populates="chunks")
\ No newline at end of file
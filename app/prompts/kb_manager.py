@@ -18,4 +18,20 @@ Decide what to do:
 - merge_both: Both contain unique information worth keeping
 
 Return JSON:
-{{"decision": "keep_existing|keep_new|merge_both", "reason": "brief explanation", "merged_value": "only if merge_both"}}"""
\ No newline at end of file
+{{"decision": "keep_existing|keep_new|merge_both", "reason": "brief explanation", "merged_value": "only if merge_both"}}"""
+
+CONFLICT_RESOLUTION_BATCH_USER = """Each pair below shows an existing attribute and a newly extracted attribute that may refer to the same information.
+
+{conflicts}
+
+For each pair decide what to do:
+- keep_existing: New info is redundant or less accurate
+- keep_new: New info is more accurate or updates old info
+- merge_both: Both contain unique information worth keeping
+
+Return JSON with one entry per pair, using the pair's id:
+{{"resolutions": [{{"id": 1, "decision": "keep_existing|keep_new|merge_both", "reason": "brief explanation", "merged_value": "only if merge_both"}}]}}"""
+
+CONFLICT_RESOLUTION_BATCH_ITEM = """**Pair {id}**
+Existing Attribute - Key: {existing_key} | Value: {existing_value} | Last Updated: {existing_date}
+New Attribute - Key: {new_key} | Value: {new_value} | Source: Just extracted from document"""
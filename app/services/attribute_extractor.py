@@ -1,21 +1,54 @@
 from app.services.llm_factory import LLMFactory
 from app.prompts.attribute_extractor import ATTRIBUTE_EXTRACTION_SYSTEM, ATTRIBUTE_EXTRACTION_USER
 from langchain_core.messages import SystemMessage, HumanMessage
+from app.services.document_processor import DocumentProcessor
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
 
 class AttributeExtractor:
     VALID_CATEGORIES = {"technical", "compliance", "business", "product"}
     MAX_TEXT_LENGTH = 3000
     MODEL = "gpt-4o-mini"
+    MAP_MAX_REQUESTS = 24
+    MAP_CONCURRENCY = 4
     
     @staticmethod
     def extract_attributes(text: str) -> List[Dict[str, str]]:
         if not text or len(text.strip()) < 50:
             return []
         
-        truncated_text = text[:AttributeExtractor.MAX_TEXT_LENGTH]
-        prompt = ATTRIBUTE_EXTRACTION_USER.format(text=truncated_text)
+        if len(text) <= AttributeExtractor.MAX_TEXT_LENGTH:
+            return AttributeExtractor._extract_from_text(text)
+        
+        return AttributeExtractor.extract_attributes_from_chunks([chunk["text"] for chunk in DocumentProcessor.chunk_text(text)])
+    
+    @staticmethod
+    def extract_attributes_from_chunks(chunks: List[str]) -> List[Dict[str, str]]:
+        total_length = sum(len(chunk) for chunk in chunks)
+        
+        if total_length <= AttributeExtractor.MAX_TEXT_LENGTH:
+            text = "\n\n".join(chunks)
+            return AttributeExtractor._extract_from_text(text) if len(text.strip()) >= 50 else []
+        
+        sections = AttributeExtractor._group_chunks(chunks)
+        logger.info(f"Extracting attributes from {len(sections)} sections of {total_length} characters")
+        
+        with ThreadPoolExecutor(max_workers=min(AttributeExtractor.MAP_CONCURRENCY, len(sections))) as executor:
+            results = list(executor.map(AttributeExtractor._extract_from_text, sections))
+        
+        attributes = AttributeExtractor._merge_attributes([attr for section in results for attr in section])
+        logger.info(f"Merged {sum(len(section) for section in results)} section attributes into {len(attributes)}")
+        
+        return attributes
+    
+    @staticmethod
+    def _extract_from_text(text: str) -> List[Dict[str, str]]:
+        prompt = ATTRIBUTE_EXTRACTION_USER.format(text=text)
         
         try:
             llm = LLMFactory.get_llm(AttributeExtractor.MODEL)
@@ -34,9 +67,43 @@ class AttributeExtractor:
             return AttributeExtractor._validate_attributes(attributes)
             
         except Exception as e:
-            print(f"Attribute extraction error: {str(e)}")
+            logger.error(f"Attribute extraction error: {str(e)}")
             return []
     
+    @staticmethod
+    def _group_chunks(chunks: List[str]) -> List[str]:
+        total_length = sum(len(chunk) for chunk in chunks)
+        section_length = max(AttributeExtractor.MAX_TEXT_LENGTH, -(-total_length // AttributeExtractor.MAP_MAX_REQUESTS))
+        
+        sections = []
+        current = []
+        current_length = 0
+        
+        for chunk in chunks:
+            if current and current_length >= section_length:
+                sections.append("\n\n".join(current))
+                current = []
+                current_length = 0
+            current.append(chunk)
+            current_length += len(chunk)
+        
+        if current:
+            sections.append("\n\n".join(current))
+        
+        return sections
+    
+    @staticmethod
+    def _merge_attributes(attributes: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        merged = {}
+        
+        for attr in attributes:
+            key = re.sub(r'[^a-z0-9]+', ' ', attr["key"].lower()).strip()
+            existing = merged.get(key)
+            if existing is None or len(str(attr["value"])) > len(str(existing["value"])):
+                merged[key] = attr
+        
+        return list(merged.values())
+    
     @staticmethod
     def _validate_attributes(attributes: List[Dict]) -> List[Dict[str, str]]:
         valid = []
@@ -48,4 +115,4 @@ class AttributeExtractor:
             if attr["category"] not in AttributeExtractor.VALID_CATEGORIES:
                 continue
             valid.append(attr)
-        return valid
\ No newline at end of file
+        return valid
@@ -1,46 +1,118 @@
 from sqlalchemy.orm import Session
 from app.models.attribute import Attribute
 from app.services.embedding_service import EmbeddingService
-from typing import List, Dict
+from app.workers.celery_app import celery_app
+from typing import List, Dict, Optional
 from uuid import UUID
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 class AttributeSearchService:
+    BACKFILL_BATCH_SIZE = 100
+    BACKFILL_CHECK_SECONDS = 300
+    
+    _backfill_checked: Dict[str, float] = {}
+    _backfill_lock = threading.Lock()
+    
     @staticmethod
-    def search_attributes(query: str, company_id: UUID, db: Session, top_k: int = 3) -> List[Dict]:
-        query_embedding = EmbeddingService.generate_embedding(query)
-        
-        all_attributes = db.query(Attribute).filter(
-            Attribute.company_id == company_id
-        ).all()
-        
-        if not all_attributes:
-            return []
+    def search_attributes(query: str, company_id: UUID, db: Session, top_k: int = 3, query_embedding: Optional[List[float]] = None) -> List[Dict]:
+        if query_embedding is None:
+            query_embedding = EmbeddingService.generate_embedding(query)
         
-        attribute_texts = [f"{attr.key}: {attr.value}" for attr in all_attributes]
-        attribute_embeddings = EmbeddingService.generate_embeddings(attribute_texts)
+        distance = Attribute.embedding.cosine_distance(query_embedding).label("distance")
         
-        from numpy import dot
-        from numpy.linalg import norm
+        rows = db.query(Attribute, distance).filter(
+            Attribute.company_id == company_id,
+            Attribute.embedding.isnot(None)
+        ).order_by(distance).limit(top_k).all()
         
-        similarities = []
-        for i, attr in enumerate(all_attributes):
-            similarity = dot(query_embedding, attribute_embeddings[i]) / (
-                norm(query_embedding) * norm(attribute_embeddings[i])
-            )
-            similarities.append({
-                "attribute": attr,
-                "similarity": float(similarity),
-                "text": attribute_texts[i]
-            })
-        
-        similarities.sort(key=lambda x: x["similarity"], reverse=True)
+        AttributeSearchService._ensure_backfilled(db, company_id)
         
         return [
             {
-                "key": s["attribute"].key,
-                "value": s["attribute"].value,
-                "category": s["attribute"].category,
-                "similarity": s["similarity"]
+                "key": attr.key,
+                "value": attr.value,
+                "category": attr.category,
+                "similarity": 1.0 - float(attr_distance)
             }
-            for s in similarities[:top_k]
-        ]
\ No newline at end of file
+            for attr, attr_distance in rows
+        ]
+    
+    @staticmethod
+    def attribute_text(key: str, value: str) -> str:
+        return f"{key}: {value}"
+    
+    @staticmethod
+    def embed_attributes(attributes: List[Attribute]) -> int:
+        if not attributes:
+            return 0
+        
+        try:
+            texts = [AttributeSearchService.attribute_text(attr.key, attr.value) for attr in attributes]
+            embeddings = EmbeddingService.generate_embeddings(texts)
+        except Exception as e:
+            logger.warning(f"Attribute embedding failed, leaving {len(attributes)} rows for backfill: {str(e)}")
+            for attr in attributes:
+                attr.embedding = None
+            return 0
+        
+        for attr, embedding in zip(attributes, embeddings):
+            attr.embedding = embedding
+        
+        return len(attributes)
+    
+    @staticmethod
+    def backfill_embeddings(db: Session, company_id: Optional[UUID] = None) -> int:
+        total = 0
+        
+        while True:
+            query = db.query(Attribute).filter(Attribute.embedding.is_(None))
+            if company_id:
+                query = query.filter(Attribute.company_id == company_id)
+            
+            pending = query.limit(AttributeSearchService.BACKFILL_BATCH_SIZE).with_for_update(skip_locked=True).all()
+            if not pending:
+                break
+            
+            embedded = AttributeSearchService.embed_attributes(pending)
+            if not embedded:
+                db.rollback()
+                break
+            
+            db.commit()
+            total += embedded
+        
+        if total:
+            logger.info(f"Backfilled embeddings for {total} attributes")
+        
+        return total
+    
+    @staticmethod
+    def _ensure_backfilled(db: Session, company_id: UUID):
+        cache_key = str(company_id)
+        now = time.monotonic()
+        
+        with AttributeSearchService._backfill_lock:
+            checked_at = AttributeSearchService._backfill_checked.get(cache_key)
+            if checked_at is not None and now - checked_at < AttributeSearchService.BACKFILL_CHECK_SECONDS:
+                return
+            AttributeSearchService._backfill_checked[cache_key] = now
+        
+        unembedded = db.query(Attribute.id).filter(
+            Attribute.company_id == company_id,
+            Attribute.embedding.is_(None)
+        ).first()
+        
+        if unembedded is not None:
+            logger.info(f"Found attributes without embeddings for company {company_id}, scheduling backfill")
+            AttributeSearchService.schedule_backfill(company_id)
+    
+    @staticmethod
+    def schedule_backfill(company_id: UUID):
+        try:
+            celery_app.send_task("backfill_attribute_embeddings", args=[str(company_id)])
+        except Exception as e:
+            logger.warning(f"Could not schedule attribute embedding backfill for company {company_id}: {str(e)}")
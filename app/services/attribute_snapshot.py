@@ -0,0 +1,138 @@
+from app.core.config import get_settings
+from app.core.redis_client import get_redis
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+from uuid import UUID
+import logging
+import threading
+import time
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class AttributeSnapshotCache:
+    VERSION_KEY = "kb_version:{company_id}"
+    BUMP_RETRY_SECONDS = 5
+    
+    def __init__(self, max_entries: int, max_age_seconds: int):
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self._snapshots: "OrderedDict[Tuple[str, str], Tuple[int, List[Dict], float]]" = OrderedDict()
+        self._unbumped = set()
+        self._retry_timer = None
+        self._lock = threading.Lock()
+    
+    def current_version(self, company_id: UUID) -> Optional[int]:
+        if str(company_id) in self._unbumped:
+            self._retry_bumps()
+            if str(company_id) in self._unbumped:
+                return None
+        
+        try:
+            version = get_redis().get(self.VERSION_KEY.format(company_id=company_id))
+            return int(version) if version is not None else 0
+        except Exception as e:
+            logger.warning(f"Could not read KB version for company {company_id}: {str(e)}")
+            return None
+    
+    def get(self, company_id: UUID, user_id: Optional[str], version: Optional[int]) -> Optional[List[Dict]]:
+        if version is None:
+            return None
+        
+        cache_key = self._cache_key(company_id, user_id)
+        
+        with self._lock:
+            entry = self._snapshots.get(cache_key)
+            if entry is None or entry[0] != version or time.monotonic() - entry[2] > self.max_age_seconds:
+                return None
+            
+            self._snapshots.move_to_end(cache_key)
+            return list(entry[1])
+    
+    def put(self, company_id: UUID, user_id: Optional[str], version: Optional[int], attributes: List[Dict]):
+        if version is None or self.max_entries <= 0:
+            return
+        
+        with self._lock:
+            self._store(self._cache_key(company_id, user_id), version, list(attributes), time.monotonic())
+    
+    def apply_writes(self, company_id: UUID, user_id: Optional[str], version: Optional[int], updated: Dict[str, Dict], inserted: List[Dict]):
+        new_version = self._bump(company_id)
+        cache_key = self._cache_key(company_id, user_id)
+        
+        with self._lock:
+            entry = self._snapshots.pop(cache_key, None)
+            
+            if entry is None or version is None or new_version != version + 1 or entry[0] != version:
+                return
+            
+            attributes = [{**attr, **updated[attr["id"]]} if attr["id"] in updated else attr for attr in entry[1]]
+            attributes.extend(inserted)
+            self._store(cache_key, new_version, attributes, entry[2])
+        
+        logger.info(f"Applied {len(updated)} updates and {len(inserted)} inserts to KB snapshot for company {company_id} at version {new_version}")
+    
+    def invalidate(self, company_id: UUID):
+        prefix = str(company_id)
+        
+        with self._lock:
+            for cache_key in [key for key in self._snapshots if key[0] == prefix]:
+                del self._snapshots[cache_key]
+        
+        self._bump(company_id)
+    
+    def _store(self, cache_key: Tuple[str, str], version: int, attributes: List[Dict], loaded_at: float):
+        self._snapshots[cache_key] = (version, attributes, loaded_at)
+        self._snapshots.move_to_end(cache_key)
+        while len(self._snapshots) > self.max_entries:
+            self._snapshots.popitem(last=False)
+    
+    def _bump(self, company_id: UUID) -> Optional[int]:
+        try:
+            return int(get_redis().incr(self.VERSION_KEY.format(company_id=company_id)))
+        except Exception as e:
+            logger.warning(f"Could not bump KB version for company {company_id}, retrying in the background: {str(e)}")
+        
+        with self._lock:
+            self._unbumped.add(str(company_id))
+            self._schedule_retry()
+        
+        return None
+    
+    def _retry_bumps(self):
+        with self._lock:
+            self._retry_timer = None
+            pending = list(self._unbumped)
+        
+        for company_id in pending:
+            try:
+                get_redis().incr(self.VERSION_KEY.format(company_id=company_id))
+            except Exception:
+                continue
+            
+            with self._lock:
+                self._unbumped.discard(company_id)
+            logger.info(f"Bumped KB version for company {company_id} after an earlier failure")
+        
+        with self._lock:
+            if self._unbumped:
+                self._schedule_retry()
+    
+    def _schedule_retry(self):
+        if self._retry_timer is not None:
+            return
+        
+        self._retry_timer = threading.Timer(self.BUMP_RETRY_SECONDS, self._retry_bumps)
+        self._retry_timer.daemon = True
+        self._retry_timer.start()
+    
+    @staticmethod
+    def _cache_key(company_id: UUID, user_id: Optional[str]) -> Tuple[str, str]:
+        return str(company_id), str(user_id) if user_id else ""
+
+
+attribute_snapshot_cache = AttributeSnapshotCache(
+    max_entries=settings.KB_SNAPSHOT_CACHE_MAX_COMPANIES,
+    max_age_seconds=settings.KB_SNAPSHOT_MAX_AGE_SECONDS
+)
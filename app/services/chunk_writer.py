@@ -0,0 +1,35 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.vector_chunk import VectorChunk
+from typing import List, Dict
+from uuid import UUID
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+class ChunkWriter:
+    INSERT_BATCH_SIZE = 500
+    
+    @staticmethod
+    def bulk_insert(db: Session, doc_id: UUID, chunks: List[Dict], embeddings: List[List[float]]) -> int:
+        if len(chunks) != len(embeddings):
+            raise ValueError(f"Got {len(embeddings)} embeddings for {len(chunks)} chunks")
+        
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "doc_id": doc_id,
+                "chunk_index": chunk["index"],
+                "chunk_text": chunk["text"],
+                "embedding": embedding,
+                "chunk_metadata": chunk["metadata"]
+            }
+            for chunk, embedding in zip(chunks, embeddings)
+        ]
+        
+        for start in range(0, len(rows), ChunkWriter.INSERT_BATCH_SIZE):
+            db.execute(insert(VectorChunk), rows[start:start + ChunkWriter.INSERT_BATCH_SIZE])
+        
+        logger.info(f"Inserted {len(rows)} chunks for document {doc_id}")
+        return len(rows)
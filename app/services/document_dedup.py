@@ -0,0 +1,49 @@
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Session
+from app.models.document import Document, ProcessingStatus
+from app.models.vector_chunk import VectorChunk
+from typing import Optional
+from uuid import UUID
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+class DocumentDeduplicator:
+    CLONED_COLUMNS = ["id", "doc_id", "chunk_text", "embedding", "chunk_index", "chunk_metadata"]
+    
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+    
+    @staticmethod
+    def find_completed_duplicate(db: Session, company_id: UUID, content_hash: str, exclude_id: Optional[UUID] = None) -> Optional[Document]:
+        if not content_hash:
+            return None
+        
+        query = db.query(Document).filter(
+            Document.company_id == company_id,
+            Document.content_hash == content_hash,
+            Document.processing_status == ProcessingStatus.COMPLETED
+        )
+        if exclude_id:
+            query = query.filter(Document.id != exclude_id)
+        
+        return query.order_by(Document.uploaded_at).first()
+    
+    @staticmethod
+    def clone_chunks(db: Session, source: Document, target: Document) -> int:
+        chunks = select(
+            func.gen_random_uuid(),
+            literal(target.id, PGUUID(as_uuid=True)),
+            VectorChunk.chunk_text,
+            VectorChunk.embedding,
+            VectorChunk.chunk_index,
+            VectorChunk.chunk_metadata
+        ).where(VectorChunk.doc_id == source.id)
+        
+        result = db.execute(insert(VectorChunk).from_select(DocumentDeduplicator.CLONED_COLUMNS, chunks))
+        
+        logger.info(f"Reused {result.rowcount} chunks from document {source.id} for duplicate {target.id}")
+        return result.rowcount
@@ -1,16 +1,18 @@
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-import pdfplumber
 from docx import Document as DocxDocument
 import openpyxl
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator
 import chardet
 from pptx import Presentation
+from app.services.rate_limiter import RateLimiter
+from app.services.pdf_extractor import PDFExtractor
 import logging
 
 logger = logging.getLogger(__name__)
 
 class DocumentProcessor:
     SUPPORTED_FORMATS = {'.pdf', '.docx', '.txt', '.md', '.xlsx', '.xls', '.pptx'}
+    CHUNK_BUFFER_FACTOR = 8
     
     @staticmethod
     def is_supported(file_type: str) -> bool:
@@ -18,137 +20,160 @@ class DocumentProcessor:
     
     @staticmethod
     def extract_text(file_path: str, file_type: str) -> str:
+        return "\n".join(DocumentProcessor.stream_text(file_path, file_type)).strip()
+    
+    @staticmethod
+    def stream_text(file_path: str, file_type: str, enforce_limits: bool = False) -> Iterator[str]:
         file_type = file_type.lower()
         
         try:
             if file_type.endswith('.pdf'):
-                return DocumentProcessor._extract_pdf(file_path)
+                blocks = DocumentProcessor._iter_pdf(file_path, enforce_limits)
             elif file_type.endswith('.docx'):
-                return DocumentProcessor._extract_docx(file_path)
+                blocks = DocumentProcessor._iter_docx(file_path)
             elif file_type.endswith(('.xlsx', '.xls')):
-                return DocumentProcessor._extract_excel(file_path)
+                blocks = DocumentProcessor._iter_excel(file_path)
             elif file_type.endswith('.pptx'):
-                return DocumentProcessor._extract_pptx(file_path)
+                blocks = DocumentProcessor._iter_pptx(file_path)
             elif file_type.endswith(('.txt', '.md')):
-                return DocumentProcessor._extract_txt(file_path)
+                blocks = DocumentProcessor._iter_txt(file_path)
             else:
                 raise ValueError(f"Unsupported file type: {file_type}")
+            
+            if enforce_limits:
+                blocks = RateLimiter.enforce_word_limit(blocks)
+            
+            yield from blocks
         except Exception as e:
             logger.error(f"Error extracting text from {file_path}: {str(e)}")
             raise
     
     @staticmethod
-    def _extract_pdf(file_path: str) -> str:
-        text = ""
+    def _iter_pdf(file_path: str, enforce_limits: bool = False) -> Iterator[str]:
+        found_text = False
+        
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    page_text = page.extract_text()
-                    if page_text:
-                        page_text = page_text.replace('\x00', '')
-                        text += f"\n--- Page {page_num + 1} ---\n"
-                        text += page_text
-                    
-                    tables = page.extract_tables()
-                    for table in tables:
-                        if table:
-                            text += "\n[TABLE]\n"
-                            for row in table:
-                                text += " | ".join([str(cell) if cell else "" for cell in row]) + "\n"
-                            text += "[/TABLE]\n"
+            page_count = PDFExtractor.page_count(file_path)
         except Exception as e:
             logger.error(f"PDF extraction error: {str(e)}")
             raise ValueError(f"Failed to extract PDF: {str(e)}")
         
-        if not text.strip():
+        if enforce_limits:
+            allowed, message = RateLimiter.validate_page_count(page_count)
+            if not allowed:
+                raise ValueError(message)
+        
+        try:
+            for page in PDFExtractor.iter_pages(file_path, include_tables=True):
+                block = DocumentProcessor._pdf_page_block(page)
+                if block:
+                    found_text = True
+                    yield block
+        except Exception as e:
+            logger.error(f"PDF extraction error: {str(e)}")
+            raise ValueError(f"Failed to extract PDF: {str(e)}")
+        
+        if not found_text:
             raise ValueError("PDF appears to be empty or contains only images")
+    
+    @staticmethod
+    def _pdf_page_block(page: Dict) -> str:
+        parts = []
+        
+        if page["text"]:
+            parts.append(f"--- Page {page['page_num'] + 1} ---\n{page['text']}")
         
-        return text.strip()
+        for table in page["tables"]:
+            if table:
+                rows = [" | ".join([str(cell) if cell else "" for cell in row]) for row in table]
+                parts.append("[TABLE]\n" + "\n".join(rows) + "\n[/TABLE]")
+        
+        return "\n".join(parts)
     
     @staticmethod
-    def _extract_docx(file_path: str) -> str:
+    def _iter_docx(file_path: str) -> Iterator[str]:
+        found_text = False
+        
         try:
             doc = DocxDocument(file_path)
-            text = []
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text.append(paragraph.text)
-            
-            for table in doc.tables:
-                text.append("\n[TABLE]")
-                for row in table.rows:
-                    row_text = " | ".join([cell.text.strip() for cell in row.cells])
-                    text.append(row_text)
-                text.append("[/TABLE]\n")
-            
-            result = "\n".join(text)
-            
-            if not result.strip():
-                raise ValueError("DOCX appears to be empty")
-            
-            return result.strip()
         except Exception as e:
             logger.error(f"DOCX extraction error: {str(e)}")
             raise ValueError(f"Failed to extract DOCX: {str(e)}")
+        
+        for paragraph in doc.paragraphs:
+            if paragraph.text.strip():
+                found_text = True
+                yield paragraph.text
+        
+        for table in doc.tables:
+            rows = [" | ".join([cell.text.strip() for cell in row.cells]) for row in table.rows]
+            found_text = True
+            yield "[TABLE]\n" + "\n".join(rows) + "\n[/TABLE]"
+        
+        if not found_text:
+            raise ValueError("DOCX appears to be empty")
     
     @staticmethod
-    def _extract_excel(file_path: str) -> str:
+    def _iter_excel(file_path: str) -> Iterator[str]:
+        found_text = False
+        
         try:
-            wb = openpyxl.load_workbook(file_path, data_only=True)
-            text = []
-            
-            for sheet_name in wb.sheetnames:
-                sheet = wb[sheet_name]
-                text.append(f"\n--- Sheet: {sheet_name} ---\n")
-                
-                for row in sheet.iter_rows(values_only=True):
-                    row_text = " | ".join([str(cell) if cell is not None else "" for cell in row])
-                    if row_text.strip():
-                        text.append(row_text)
-            
-            result = "\n".join(text)
-            
-            if not result.strip():
-                raise ValueError("Excel file appears to be empty")
-            
-            return result.strip()
+            wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
         except Exception as e:
             logger.error(f"Excel extraction error: {str(e)}")
             raise ValueError(f"Failed to extract Excel: {str(e)}")
+        
+        try:
+            for sheet in wb.worksheets:
+                rows = [f"--- Sheet: {sheet.title} ---"]
+                
+                for row in sheet.iter_rows(values_only=True):
+                    row_text = " | ".join([str(cell) if cell is not None else "" for cell in row])
+                    if row_text.strip(" |"):
+                        rows.append(row_text)
+                
+                if len(rows) > 1:
+                    found_text = True
+                    yield "\n".join(rows)
+        finally:
+            wb.close()
+        
+        if not found_text:
+            raise ValueError("Excel file appears to be empty")
     
     @staticmethod
-    def _extract_pptx(file_path: str) -> str:
+    def _iter_pptx(file_path: str) -> Iterator[str]:
+        found_text = False
+        
         try:
             prs = Presentation(file_path)
-            text = []
-            
-            for slide_num, slide in enumerate(prs.slides):
-                text.append(f"\n--- Slide {slide_num + 1} ---\n")
-                
-                for shape in slide.shapes:
-                    if hasattr(shape, "text") and shape.text.strip():
-                        text.append(shape.text)
-                    
-                    if shape.has_table:
-                        text.append("\n[TABLE]")
-                        for row in shape.table.rows:
-                            row_text = " | ".join([cell.text.strip() for cell in row.cells])
-                            text.append(row_text)
-                        text.append("[/TABLE]\n")
-            
-            result = "\n".join(text)
-            
-            if not result.strip():
-                raise ValueError("PowerPoint appears to be empty")
-            
-            return result.strip()
         except Exception as e:
             logger.error(f"PPTX extraction error: {str(e)}")
             raise ValueError(f"Failed to extract PPTX: {str(e)}")
+        
+        for slide_num, slide in enumerate(prs.slides):
+            text = [f"--- Slide {slide_num + 1} ---"]
+            
+            for shape in slide.shapes:
+                if hasattr(shape, "text") and shape.text.strip():
+                    text.append(shape.text)
+                
+                if shape.has_table:
+                    text.append("[TABLE]")
+                    for row in shape.table.rows:
+                        row_text = " | ".join([cell.text.strip() for cell in row.cells])
+                        text.append(row_text)
+                    text.append("[/TABLE]")
+            
+            if len(text) > 1:
+                found_text = True
+                yield "\n".join(text)
+        
+        if not found_text:
+            raise ValueError("PowerPoint appears to be empty")
     
     @staticmethod
-    def _extract_txt(file_path: str) -> str:
+    def _iter_txt(file_path: str) -> Iterator[str]:
         try:
             with open(file_path, 'rb') as f:
                 raw_data = f.read()
@@ -157,20 +182,24 @@ class DocumentProcessor:
             encoding = detected['encoding'] or 'utf-8'
             
             text = raw_data.decode(encoding, errors='replace')
-            
-            if not text.strip():
-                raise ValueError("Text file appears to be empty")
-            
-            return text.strip()
         except Exception as e:
             logger.error(f"TXT extraction error: {str(e)}")
             raise ValueError(f"Failed to extract text file: {str(e)}")
+        
+        if not text.strip():
+            raise ValueError("Text file appears to be empty")
+        
+        yield text.strip()
     
     @staticmethod
     def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[Dict[str, any]]:
         if not text or not text.strip():
             raise ValueError("Cannot chunk empty text")
         
+        return list(DocumentProcessor.chunk_blocks([text], chunk_size=chunk_size, overlap=overlap))
+    
+    @staticmethod
+    def chunk_blocks(blocks: Iterable[str], chunk_size: int = 1000, overlap: int = 200) -> Iterator[Dict[str, any]]:
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=overlap,
@@ -179,17 +208,42 @@ class DocumentProcessor:
             is_separator_regex=False
         )
         
-        chunks = text_splitter.split_text(text)
+        flush_size = chunk_size * DocumentProcessor.CHUNK_BUFFER_FACTOR
+        buffer = []
+        buffered_chars = 0
+        index = 0
         
-        return [
-            {
-                "text": chunk.strip(),
-                "index": i,
-                "metadata": {
-                    "char_count": len(chunk),
-                    "word_count": len(chunk.split()),
-                }
+        for block in blocks:
+            buffer.append(block)
+            buffered_chars += len(block) + 1
+            
+            if buffered_chars < flush_size:
+                continue
+            
+            pieces = text_splitter.split_text("\n".join(buffer))
+            for piece in pieces[:-1]:
+                if piece.strip():
+                    yield DocumentProcessor._make_chunk(piece, index)
+                    index += 1
+            
+            buffer = pieces[-1:]
+            buffered_chars = sum(len(piece) for piece in buffer)
+        
+        for piece in text_splitter.split_text("\n".join(buffer)) if buffer else []:
+            if piece.strip():
+                yield DocumentProcessor._make_chunk(piece, index)
+                index += 1
+        
+        if index == 0:
+            raise ValueError("Cannot chunk empty text")
+    
+    @staticmethod
+    def _make_chunk(text: str, index: int) -> Dict[str, any]:
+        return {
+            "text": text.strip(),
+            "index": index,
+            "metadata": {
+                "char_count": len(text),
+                "word_count": len(text.split()),
             }
-            for i, chunk in enumerate(chunks)
-            if chunk.strip()
-        ]
\ No newline at end of file
+        }
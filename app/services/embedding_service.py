@@ -1,18 +1,207 @@
 from langchain_openai import OpenAIEmbeddings
 from app.core.config import get_settings
-from typing import List
+from app.core.redis_client import get_redis
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Tuple, Callable
+import hashlib
+import logging
+import random
+import threading
+import time
+import numpy as np
+import openai
+import tiktoken
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
 embeddings = OpenAIEmbeddings(
-    model="text-embedding-3-small",
-    openai_api_key=settings.OPENAI_API_KEY
+    model=EMBEDDING_MODEL,
+    openai_api_key=settings.OPENAI_API_KEY,
+    max_retries=0
 )
 
+
+@lru_cache()
+def get_encoding() -> tiktoken.Encoding:
+    return tiktoken.encoding_for_model(EMBEDDING_MODEL)
+
+
+class EmbeddingCache:
+    KEY = "embedding:{model}:{digest}"
+    
+    def __init__(self, model: str, max_bytes: int, ttl_seconds: int):
+        self.model = model
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+    
+    def key(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return self.KEY.format(model=self.model, digest=digest)
+    
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        
+        with self._lock:
+            for key in keys:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = value
+        
+        remote_keys = [key for key in dict.fromkeys(keys) if key not in found]
+        if remote_keys:
+            try:
+                values = get_redis().mget(remote_keys)
+            except Exception as e:
+                logger.warning(f"Embedding cache lookup failed for {len(remote_keys)} keys: {str(e)}")
+                values = []
+            
+            remote = {key: value for key, value in zip(remote_keys, values) if value is not None}
+            self._remember(remote)
+            found.update(remote)
+        
+        return {key: np.frombuffer(value, dtype=np.float32).tolist() for key, value in found.items()}
+    
+    def set_many(self, vectors: Dict[str, List[float]]):
+        if not vectors:
+            return
+        
+        encoded = {key: np.asarray(vector, dtype=np.float32).tobytes() for key, vector in vectors.items()}
+        self._remember(encoded)
+        
+        try:
+            pipeline = get_redis().pipeline(transaction=False)
+            for key, value in encoded.items():
+                pipeline.set(key, value, ex=self.ttl_seconds)
+            pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed for {len(vectors)} keys: {str(e)}")
+    
+    def _remember(self, encoded: Dict[str, bytes]):
+        with self._lock:
+            for key, value in encoded.items():
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self._total_bytes -= len(key) + len(previous)
+                
+                self._entries[key] = value
+                self._total_bytes += len(key) + len(value)
+            
+            while self._total_bytes > self.max_bytes and self._entries:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted_key) + len(evicted)
+
+
+embedding_cache = EmbeddingCache(
+    model=EMBEDDING_MODEL,
+    max_bytes=settings.EMBEDDING_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS
+)
+
+
 class EmbeddingService:
     @staticmethod
     def generate_embeddings(texts: List[str]) -> List[List[float]]:
-        return embeddings.embed_documents(texts)
+        if not texts:
+            return []
+        
+        if not settings.EMBEDDING_CACHE_ENABLED:
+            return EmbeddingService._embed_batches(texts)
+        
+        keys = [embedding_cache.key(text) for text in texts]
+        vectors = embedding_cache.get_many(keys)
+        
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        
+        if missing:
+            fresh = dict(zip(missing.keys(), EmbeddingService._embed_batches(list(missing.values()))))
+            embedding_cache.set_many(fresh)
+            vectors.update(fresh)
+        
+        logger.info(f"Embedded {len(texts)} texts: {len(texts) - len(missing)} from cache, {len(missing)} from API")
+        return [vectors[key] for key in keys]
     
     @staticmethod
     def generate_embedding(text: str) -> List[float]:
-        return embeddings.embed_query(text)
\ No newline at end of file
+        if not settings.EMBEDDING_CACHE_ENABLED:
+            return EmbeddingService._with_retry(embeddings.embed_query, text)
+        
+        key = embedding_cache.key(text)
+        vector = embedding_cache.get_many([key]).get(key)
+        
+        if vector is None:
+            vector = EmbeddingService._with_retry(embeddings.embed_query, text)
+            embedding_cache.set_many({key: vector})
+        
+        return vector
+    
+    @staticmethod
+    def _embed_batches(texts: List[str]) -> List[List[float]]:
+        batches = EmbeddingService._token_batches(texts)
+        
+        if len(batches) == 1:
+            return EmbeddingService._with_retry(embeddings.embed_documents, texts)
+        
+        workers = min(settings.EMBEDDING_CONCURRENCY, len(batches))
+        logger.info(f"Embedding {len(texts)} texts in {len(batches)} batches with {workers} workers")
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(EmbeddingService._with_retry, embeddings.embed_documents, texts[start:end])
+                for start, end in batches
+            ]
+            return [vector for future in futures for vector in future.result()]
+    
+    @staticmethod
+    def _token_batches(texts: List[str]) -> List[Tuple[int, int]]:
+        encoding = get_encoding()
+        batches = []
+        start = 0
+        batch_tokens = 0
+        
+        for i, text in enumerate(texts):
+            tokens = len(encoding.encode(text, disallowed_special=()))
+            
+            if i > start and (
+                batch_tokens + tokens > settings.EMBEDDING_BATCH_MAX_TOKENS
+                or i - start >= settings.EMBEDDING_BATCH_MAX_INPUTS
+            ):
+                batches.append((start, i))
+                start = i
+                batch_tokens = 0
+            
+            batch_tokens += tokens
+        
+        batches.append((start, len(texts)))
+        return batches
+    
+    @staticmethod
+    def _with_retry(embed: Callable, payload):
+        for attempt in range(settings.EMBEDDING_MAX_RETRIES + 1):
+            try:
+                return embed(payload)
+            except RETRYABLE_ERRORS as e:
+                if attempt == settings.EMBEDDING_MAX_RETRIES:
+                    raise
+                
+                delay = random.uniform(0, settings.EMBEDDING_RETRY_BASE_DELAY * 2 ** attempt)
+                logger.warning(f"Embedding request failed ({type(e).__name__}), retry {attempt + 1}/{settings.EMBEDDING_MAX_RETRIES} in {delay:.1f}s")
+                time.sleep(delay)
@@ -0,0 +1,84 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Dict, Iterator
+from app.core.config import get_settings
+import logging
+import os
+import pdfplumber
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _extract_page_range(file_path: str, start: int, end: int, include_tables: bool) -> List[Dict]:
+    with pdfplumber.open(file_path) as pdf:
+        return [PDFExtractor.extract_page(pdf.pages[i], i, include_tables) for i in range(start, end)]
+
+
+class PDFExtractor:
+    PAGES_PER_TASK = 8
+    MIN_PAGES_FOR_POOL = 16
+    
+    @staticmethod
+    def page_count(file_path: str) -> int:
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+    
+    @staticmethod
+    def extract_page(page, page_num: int, include_tables: bool = True) -> Dict:
+        try:
+            text = (page.extract_text() or "").replace('\x00', '')
+            tables = page.extract_tables() if include_tables else []
+        finally:
+            page.close()
+        
+        return {"page_num": page_num, "text": text, "tables": tables}
+    
+    @staticmethod
+    def iter_pages(file_path: str, include_tables: bool = True) -> Iterator[Dict]:
+        page_count = PDFExtractor.page_count(file_path)
+        workers = PDFExtractor._worker_count(page_count)
+        
+        if workers <= 1:
+            yield from PDFExtractor._iter_pages_serial(file_path, include_tables)
+            return
+        
+        starts = list(range(0, page_count, PDFExtractor.PAGES_PER_TASK))
+        ends = [min(start + PDFExtractor.PAGES_PER_TASK, page_count) for start in starts]
+        
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(_extract_page_range, repeat(file_path), starts, ends, repeat(include_tables))
+        except (AssertionError, OSError) as e:
+            logger.warning(f"Process pool unavailable, extracting {page_count} PDF pages serially: {str(e)}")
+            yield from PDFExtractor._iter_pages_serial(file_path, include_tables)
+            return
+        
+        logger.info(f"Extracting {page_count} PDF pages in {len(starts)} ranges across {workers} processes")
+        
+        try:
+            for pages in results:
+                yield from pages
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _iter_pages_serial(file_path: str, include_tables: bool) -> Iterator[Dict]:
+        with pdfplumber.open(file_path) as pdf:
+            for page_num, page in enumerate(pdf.pages):
+                yield PDFExtractor.extract_page(page, page_num, include_tables)
+    
+    @staticmethod
+    def _worker_count(page_count: int) -> int:
+        if page_count < PDFExtractor.MIN_PAGES_FOR_POOL:
+            return 1
+        
+        try:
+            cores = len(os.sched_getaffinity(0))
+        except AttributeError:
+            cores = os.cpu_count() or 1
+        
+        max_workers = settings.PDF_EXTRACTION_MAX_WORKERS or cores
+        ranges = -(-page_count // PDFExtractor.PAGES_PER_TASK)
+        
+        return max(1, min(max_workers, cores, ranges))
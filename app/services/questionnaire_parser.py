@@ -0,0 +1,170 @@
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
+from itertools import chain, islice
+from openpyxl.utils import column_index_from_string
+import csv
+import logging
+import re
+import openpyxl
+
+logger = logging.getLogger(__name__)
+
+class QuestionnaireParser:
+    SUPPORTED_FORMATS = ('.xlsx', '.xlsm', '.csv')
+    
+    HEADER_KEYWORDS = ['question', 'requirement', 'query', 'control', 'criteria', 'description']
+    HEADER_PATTERNS = [re.compile(rf'\b{keyword}s?\b', re.IGNORECASE) for keyword in HEADER_KEYWORDS]
+    EXACT_HEADERS = {'question', 'questions'}
+    ID_HEADER_PATTERN = re.compile(r'\b(id|no|nr|num|number|ref|reference|code)\b|#', re.IGNORECASE)
+    HEADER_SCAN_ROWS = 10
+    SAMPLE_ROWS = 50
+    MIN_COLUMN_SCORE = 3
+    MIN_QUESTION_LENGTH = 10
+    
+    @staticmethod
+    def is_supported(file_type: str) -> bool:
+        return file_type.lower().endswith(QuestionnaireParser.SUPPORTED_FORMATS)
+    
+    @staticmethod
+    def extract_questions(file_path: str, file_type: str, question_column: Optional[str] = None) -> List[Dict]:
+        questions = []
+        
+        for sheet_name, rows in QuestionnaireParser._iter_sheets(file_path, file_type):
+            numbered_rows = enumerate(rows, start=1)
+            sample = list(islice(numbered_rows, QuestionnaireParser.SAMPLE_ROWS))
+            
+            header_row, column = QuestionnaireParser._find_question_column(sample, question_column)
+            if column is None:
+                logger.info(f"No question column found in sheet {sheet_name or file_type}, skipping")
+                continue
+            
+            sheet_questions = 0
+            for row_number, row in chain(sample, numbered_rows):
+                if row_number <= header_row or column >= len(row):
+                    continue
+                
+                value = row[column]
+                if not isinstance(value, str):
+                    continue
+                
+                text = value.strip()
+                if len(text) < QuestionnaireParser.MIN_QUESTION_LENGTH:
+                    continue
+                
+                questions.append({"text": text, "sheet": sheet_name, "row": row_number})
+                sheet_questions += 1
+            
+            logger.info(f"Read {sheet_questions} questions from column {column + 1} of sheet {sheet_name or file_type}")
+        
+        return questions
+    
+    @staticmethod
+    def _iter_sheets(file_path: str, file_type: str) -> Iterator[Tuple[Optional[str], Iterable[tuple]]]:
+        if file_type.lower().endswith('.csv'):
+            with open(file_path, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+                try:
+                    dialect = csv.Sniffer().sniff(f.read(8192), delimiters=',;\t|')
+                except csv.Error:
+                    dialect = csv.excel
+                f.seek(0)
+                yield None, csv.reader(f, dialect)
+            return
+        
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for sheet in wb.worksheets:
+                yield sheet.title, sheet.iter_rows(values_only=True)
+        finally:
+            wb.close()
+    
+    @staticmethod
+    def _find_question_column(sample: List[Tuple[int, tuple]], question_column: Optional[str]) -> Tuple[int, Optional[int]]:
+        header_rows = sample[:QuestionnaireParser.HEADER_SCAN_ROWS]
+        
+        if question_column:
+            wanted = question_column.strip().lower()
+            for row_number, row in header_rows:
+                for i, cell in enumerate(row):
+                    if isinstance(cell, str) and cell.strip().lower() == wanted:
+                        return row_number, i
+            
+            if re.fullmatch(r'[a-z]{1,3}', wanted):
+                column = column_index_from_string(wanted.upper()) - 1
+                width = max((len(row) for _, row in sample), default=0)
+                if column < width:
+                    return QuestionnaireParser._find_header_row(header_rows), column
+            
+            logger.warning(f"Question column '{question_column}' not found, detecting it instead")
+        
+        candidates = []
+        for row_number, row in header_rows:
+            for i, cell in enumerate(row):
+                if not isinstance(cell, str) or len(cell) > 50 or QuestionnaireParser.ID_HEADER_PATTERN.search(cell):
+                    continue
+                
+                keyword_rank = next(
+                    (rank for rank, pattern in enumerate(QuestionnaireParser.HEADER_PATTERNS) if pattern.search(cell)),
+                    None
+                )
+                if keyword_rank is None:
+                    continue
+                
+                score = QuestionnaireParser._column_score(sample, i, row_number)
+                if score is None:
+                    continue
+                
+                exact = cell.strip().lower() in QuestionnaireParser.EXACT_HEADERS
+                candidates.append((not exact, -score, keyword_rank, row_number, i))
+        
+        if candidates:
+            _, _, _, row_number, column = min(candidates)
+            return row_number, column
+        
+        scores = {}
+        for _, row in sample:
+            for i, cell in enumerate(row):
+                if not isinstance(cell, str):
+                    continue
+                text = cell.strip()
+                if text.endswith('?'):
+                    scores[i] = scores.get(i, 0) + 2
+                elif len(text.split()) >= 5:
+                    scores[i] = scores.get(i, 0) + 1
+        
+        if not scores:
+            return 0, None
+        
+        column, score = max(scores.items(), key=lambda item: item[1])
+        if score < QuestionnaireParser.MIN_COLUMN_SCORE:
+            return 0, None
+        
+        return 0, column
+    
+    @staticmethod
+    def _find_header_row(header_rows: List[Tuple[int, tuple]]) -> int:
+        for row_number, row in header_rows:
+            for cell in row:
+                if isinstance(cell, str) and len(cell) <= 50 and any(pattern.search(cell) for pattern in QuestionnaireParser.HEADER_PATTERNS):
+                    return row_number
+        
+        return 0
+    
+    @staticmethod
+    def _column_score(sample: List[Tuple[int, tuple]], column: int, header_row: int) -> Optional[int]:
+        score = 0
+        has_text = False
+        
+        for row_number, row in sample:
+            if row_number <= header_row or column >= len(row) or not isinstance(row[column], str):
+                continue
+            
+            text = row[column].strip()
+            if len(text) < QuestionnaireParser.MIN_QUESTION_LENGTH:
+                continue
+            
+            has_text = True
+            if text.endswith('?'):
+                score += 2
+            elif len(text.split()) >= 5:
+                score += 1
+        
+        return score if has_text else None
@@ -1,79 +1,184 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Text, cast, func, text
+from sqlalchemy.orm import Session, defer
 from app.models.vector_chunk import VectorChunk
 from app.models.document import Document
 from app.services.embedding_service import EmbeddingService
-from typing import List, Dict
-from rank_bm25 import BM25Okapi
+from typing import List, Dict, Tuple, Optional
 from app.core.config import get_settings
+from app.core.redis_client import get_redis
+from collections import OrderedDict
 from uuid import UUID
 import cohere
 import logging
+import threading
 import numpy as np
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+ITERATIVE_SCAN_MODES = {"off", "strict_order", "relaxed_order"}
+
+
+class CompanyEmbeddingIndex:
+    def __init__(self, chunk_ids: np.ndarray, matrix: np.ndarray, version: Optional[int]):
+        self.chunk_ids = chunk_ids
+        self.matrix = matrix
+        self.version = version
+    
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes + self.chunk_ids.nbytes
+    
+    @classmethod
+    def load(cls, db: Session, company_id: UUID, version: Optional[int]) -> "CompanyEmbeddingIndex":
+        rows = db.query(VectorChunk.id, VectorChunk.embedding).join(Document).filter(
+            Document.company_id == company_id,
+            VectorChunk.embedding.isnot(None)
+        ).all()
+        
+        chunk_ids = np.frombuffer(b"".join(row.id.bytes for row in rows), dtype=np.uint8).reshape(-1, 16)
+        
+        if not rows:
+            return cls(chunk_ids, np.empty((0, 0), dtype=np.float32), version)
+        
+        matrix = np.ascontiguousarray(np.vstack([row.embedding for row in rows]), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        
+        return cls(chunk_ids, matrix, version)
+    
+    def search(self, query_embedding: List[float], limit: int) -> List[Tuple[UUID, float]]:
+        if len(self.chunk_ids) == 0:
+            return []
+        
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query_vector)
+        if query_norm == 0:
+            return []
+        
+        scores = self.matrix @ (query_vector / query_norm)
+        
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        
+        return [(UUID(bytes=self.chunk_ids[i].tobytes()), float(scores[i])) for i in top]
+
+
+class CompanyEmbeddingIndexCache:
+    VERSION_KEY = "rag_index_version:{company_id}"
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._indexes: "OrderedDict[str, CompanyEmbeddingIndex]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+    
+    def get(self, db: Session, company_id: UUID) -> CompanyEmbeddingIndex:
+        cache_key = str(company_id)
+        version = self._current_version(company_id)
+        
+        index = self._lookup(cache_key, version)
+        if index is not None:
+            return index
+        
+        with self._lock:
+            load_lock = self._load_locks.setdefault(cache_key, threading.Lock())
+        
+        with load_lock:
+            index = self._lookup(cache_key, version)
+            if index is not None:
+                return index
+            
+            index = CompanyEmbeddingIndex.load(db, company_id, version)
+            logger.info(f"Loaded embedding index for company {company_id}: {len(index.chunk_ids)} chunks, {index.nbytes / (1024 * 1024):.1f}MB")
+            
+            if version is not None:
+                self._store(cache_key, index)
+        
+        return index
+    
+    def invalidate(self, company_id: UUID):
+        with self._lock:
+            self._discard(str(company_id))
+        
+        try:
+            get_redis().incr(self.VERSION_KEY.format(company_id=company_id))
+        except Exception as e:
+            logger.warning(f"Could not bump embedding index version for company {company_id}: {str(e)}")
+    
+    def _lookup(self, cache_key: str, version: Optional[int]) -> Optional[CompanyEmbeddingIndex]:
+        if version is None:
+            return None
+        
+        with self._lock:
+            index = self._indexes.get(cache_key)
+            if index is None or index.version != version:
+                return None
+            
+            self._indexes.move_to_end(cache_key)
+            return index
+    
+    def _store(self, cache_key: str, index: CompanyEmbeddingIndex):
+        with self._lock:
+            self._discard(cache_key)
+            if index.nbytes <= self.max_bytes:
+                self._indexes[cache_key] = index
+                self._total_bytes += index.nbytes
+                while self._total_bytes > self.max_bytes:
+                    evicted_key, evicted = self._indexes.popitem(last=False)
+                    self._total_bytes -= evicted.nbytes
+                    logger.info(f"Evicted embedding index for company {evicted_key}")
+    
+    def _discard(self, cache_key: str):
+        index = self._indexes.pop(cache_key, None)
+        if index is not None:
+            self._total_bytes -= index.nbytes
+    
+    def _current_version(self, company_id: UUID) -> Optional[int]:
+        try:
+            version = get_redis().get(self.VERSION_KEY.format(company_id=company_id))
+            return int(version) if version is not None else 0
+        except Exception as e:
+            logger.warning(f"Could not read embedding index version for company {company_id}: {str(e)}")
+            return None
+
+
+embedding_index_cache = CompanyEmbeddingIndexCache(max_bytes=settings.RAG_INDEX_CACHE_MAX_MB * 1024 * 1024)
+
+
 class RAGService:
     @staticmethod
-    def search_similar_chunks(query: str, db: Session, company_id: UUID, top_k: int = 8) -> List[Dict]:
+    def search_similar_chunks(query: str, db: Session, company_id: UUID, top_k: int = 8, query_embedding: Optional[List[float]] = None) -> List[Dict]:
+        candidates = RAGService.retrieve_candidates(query, db, company_id, top_k=top_k, query_embedding=query_embedding)
+        
+        if not candidates:
+            return []
+        
+        return RAGService.rerank(query, candidates, top_k=top_k)
+    
+    @staticmethod
+    def retrieve_candidates(query: str, db: Session, company_id: UUID, top_k: int = 8, query_embedding: Optional[List[float]] = None) -> List[Dict]:
         try:
             logger.info(f"RAG search called with company_id: {company_id}, query: {query[:100]}")
             
-            all_chunks = db.query(VectorChunk).join(Document).filter(
-                Document.company_id == company_id
-            ).all()
+            if query_embedding is None:
+                query_embedding = EmbeddingService.generate_embedding(query)
+                logger.info(f"Generated query embedding, dim: {len(query_embedding)}")
             
-            logger.info(f"Found {len(all_chunks)} chunks in database for company {company_id}")
+            vector_results = RAGService._vector_search(query_embedding, db, company_id, limit=top_k * 3)
             
-            if not all_chunks:
+            if not vector_results:
                 logger.warning(f"No chunks found for company {company_id}")
                 return []
             
-            query_embedding = EmbeddingService.generate_embedding(query)
-            query_embedding = np.array(query_embedding)
-            logger.info(f"Generated query embedding, shape: {query_embedding.shape}")
-            
-            def cosine_similarity(a, b):
-                a = np.array(a, dtype=np.float32)
-                b = np.array(b, dtype=np.float32)
-                return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
-            
-            vector_scores = []
-            for chunk in all_chunks:
-                if chunk.embedding is None:
-                    logger.warning(f"Chunk {chunk.id} has NULL embedding, skipping")
-                    continue
-                
-                try:
-                    chunk_embedding = np.array(list(chunk.embedding), dtype=np.float32)
-                    similarity = cosine_similarity(query_embedding, chunk_embedding)
-                    vector_scores.append((chunk, similarity))
-                except Exception as e:
-                    logger.error(f"Error calculating similarity for chunk {chunk.id}: {str(e)}")
-                    continue
-            
-            logger.info(f"Calculated similarities for {len(vector_scores)} chunks")
-            
-            if not vector_scores:
-                logger.warning("No valid vector scores calculated")
-                return []
-            
-            vector_results = sorted(vector_scores, key=lambda x: x[1], reverse=True)[:top_k * 3]
-            
             logger.info(f"Vector search returned {len(vector_results)} results, top score: {vector_results[0][1]:.4f}")
             
-            corpus = [chunk.chunk_text for chunk in all_chunks]
-            tokenized_corpus = [doc.split() for doc in corpus]
-            bm25 = BM25Okapi(tokenized_corpus)
+            lexical_results = RAGService._lexical_search(query, db, company_id, limit=top_k * 3)
             
-            tokenized_query = query.split()
-            bm25_scores = bm25.get_scores(tokenized_query)
-            
-            bm25_results = sorted(
-                zip(all_chunks, bm25_scores),
-                key=lambda x: x[1],
-                reverse=True
-            )[:top_k * 3]
+            logger.info(f"Lexical search returned {len(lexical_results)} results")
             
             combined_chunks = {}
             for chunk, score in vector_results:
@@ -85,7 +190,7 @@ class RAGService:
                     "bm25_score": 0.0
                 }
             
-            for chunk, score in bm25_results:
+            for chunk, score in lexical_results:
                 chunk_id = str(chunk.id)
                 if chunk_id in combined_chunks:
                     combined_chunks[chunk_id]["bm25_score"] = float(score)
@@ -100,7 +205,7 @@ class RAGService:
             
             hybrid_results = []
             for chunk_id, data in combined_chunks.items():
-                hybrid_score = float(data["vector_score"] * 0.7 + (data["bm25_score"] / 10) * 0.3)
+                hybrid_score = float(data["vector_score"] * 0.7 + data["bm25_score"] * 0.3)
                 data["hybrid_score"] = hybrid_score
                 hybrid_results.append(data)
             
@@ -113,46 +218,128 @@ class RAGService:
             logger.info(f"Hybrid search returned {len(hybrid_results)} results")
             
             if not hybrid_results:
-                logger.warning("No hybrid results after combining vector and BM25")
+                logger.warning("No hybrid results after combining vector and lexical")
                 return []
             
-            try:
-                co = cohere.Client(settings.COHERE_API_KEY)
-                
-                documents = [r["text"] for r in hybrid_results]
-                
-                rerank_response = co.rerank(
-                    model="rerank-english-v3.0",
-                    query=query,
-                    documents=documents,
-                    top_n=top_k,
-                    return_documents=True
-                )
-                
-                reranked_results = []
-                for result in rerank_response.results:
-                    original_data = hybrid_results[result.index]
-                    reranked_results.append({
-                        "id": original_data["id"],
-                        "text": original_data["text"],
-                        "metadata": original_data["metadata"],
-                        "vector_score": float(original_data["vector_score"]),
-                        "bm25_score": float(original_data["bm25_score"]),
-                        "hybrid_score": float(original_data["hybrid_score"]),
-                        "rerank_score": float(result.relevance_score)
-                    })
-                
-                logger.info(f"Reranked {len(reranked_results)} chunks, top rerank score: {reranked_results[0]['rerank_score']:.4f}")
-                return reranked_results
-                
-            except Exception as e:
-                logger.error(f"Cohere reranking failed: {str(e)}, using hybrid scores")
-                
-                for r in hybrid_results[:top_k]:
-                    r["rerank_score"] = float(r["hybrid_score"])
-                
-                return hybrid_results[:top_k]
-                
+            return hybrid_results
+            
         except Exception as e:
             logger.error(f"Error in RAG search: {str(e)}", exc_info=True)
-            return []
\ No newline at end of file
+            return []
+    
+    @staticmethod
+    def rerank(query: str, hybrid_results: List[Dict], top_k: int = 8) -> List[Dict]:
+        try:
+            co = cohere.Client(settings.COHERE_API_KEY)
+            
+            documents = [r["text"] for r in hybrid_results]
+            
+            rerank_response = co.rerank(
+                model="rerank-english-v3.0",
+                query=query,
+                documents=documents,
+                top_n=top_k,
+                return_documents=True
+            )
+            
+            reranked_results = []
+            for result in rerank_response.results:
+                original_data = hybrid_results[result.index]
+                reranked_results.append({
+                    "id": original_data["id"],
+                    "text": original_data["text"],
+                    "metadata": original_data["metadata"],
+                    "vector_score": float(original_data["vector_score"]),
+                    "bm25_score": float(original_data["bm25_score"]),
+                    "hybrid_score": float(original_data["hybrid_score"]),
+                    "rerank_score": float(result.relevance_score)
+                })
+            
+            logger.info(f"Reranked {len(reranked_results)} chunks, top rerank score: {reranked_results[0]['rerank_score']:.4f}")
+            return reranked_results
+            
+        except Exception as e:
+            logger.error(f"Cohere reranking failed: {str(e)}, using hybrid scores")
+            
+            for r in hybrid_results[:top_k]:
+                r["rerank_score"] = float(r["hybrid_score"])
+            
+            return hybrid_results[:top_k]
+    
+    @staticmethod
+    def _lexical_search(query: str, db: Session, company_id: UUID, limit: int) -> List[Tuple[VectorChunk, float]]:
+        ts_query = func.to_tsquery(
+            "simple",
+            func.replace(cast(func.plainto_tsquery("english", query), Text), " & ", " | ")
+        )
+        rank = func.ts_rank_cd(VectorChunk.search_vector, ts_query, 32).label("rank")
+        
+        rows = db.query(VectorChunk, rank).join(Document).options(
+            defer(VectorChunk.embedding)
+        ).filter(
+            Document.company_id == company_id,
+            VectorChunk.search_vector.op("@@")(ts_query)
+        ).order_by(rank.desc()).limit(limit).all()
+        
+        return [(chunk, float(chunk_rank)) for chunk, chunk_rank in rows]
+    
+    @staticmethod
+    def invalidate_company_index(company_id: UUID):
+        embedding_index_cache.invalidate(company_id)
+    
+    @staticmethod
+    def _vector_search(query_embedding: List[float], db: Session, company_id: UUID, limit: int) -> List[Tuple[VectorChunk, float]]:
+        if settings.VECTOR_SEARCH_BACKEND == "memory":
+            return RAGService._memory_vector_search(query_embedding, db, company_id, limit)
+        return RAGService._pgvector_search(query_embedding, db, company_id, limit)
+    
+    @staticmethod
+    def _memory_vector_search(query_embedding: List[float], db: Session, company_id: UUID, limit: int) -> List[Tuple[VectorChunk, float]]:
+        index = embedding_index_cache.get(db, company_id)
+        scored_ids = index.search(query_embedding, limit)
+        
+        if not scored_ids:
+            return []
+        
+        chunks = db.query(VectorChunk).options(
+            defer(VectorChunk.embedding)
+        ).filter(
+            VectorChunk.id.in_([chunk_id for chunk_id, _ in scored_ids])
+        ).all()
+        chunks_by_id = {chunk.id: chunk for chunk in chunks}
+        
+        return [
+            (chunks_by_id[chunk_id], score)
+            for chunk_id, score in scored_ids
+            if chunk_id in chunks_by_id
+        ]
+    
+    @staticmethod
+    def _pgvector_search(query_embedding: List[float], db: Session, company_id: UUID, limit: int) -> List[Tuple[VectorChunk, float]]:
+        ef_search = min(max(settings.VECTOR_SEARCH_EF_SEARCH, limit), 1000)
+        db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+        
+        iterative_scan = settings.VECTOR_SEARCH_ITERATIVE_SCAN
+        if iterative_scan in ITERATIVE_SCAN_MODES:
+            db.execute(text(f"SET LOCAL hnsw.iterative_scan = {iterative_scan}"))
+        elif iterative_scan:
+            logger.warning(f"Ignoring unknown VECTOR_SEARCH_ITERATIVE_SCAN value: {iterative_scan!r}")
+        
+        distance = VectorChunk.embedding.cosine_distance(query_embedding).label("distance")
+        query = db.query(VectorChunk, distance).join(Document).options(
+            defer(VectorChunk.embedding)
+        ).filter(
+            Document.company_id == company_id,
+            VectorChunk.embedding.isnot(None)
+        ).order_by(distance).limit(limit)
+        
+        rows = query.all()
+        
+        # The HNSW index spans every company and the company filter runs after it,
+        # so a short result may just mean the scan ran out of this company's rows.
+        if len(rows) < limit:
+            db.execute(text("SET LOCAL enable_indexscan = off"))
+            rows = query.all()
+            db.execute(text("SET LOCAL enable_indexscan = on"))
+        
+        return [(chunk, 1.0 - float(chunk_distance)) for chunk, chunk_distance in rows]
\ No newline at end of file
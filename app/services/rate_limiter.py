@@ -3,6 +3,7 @@ from app.models.document_quota import DocumentQuota
 from app.models.resync_quota import ResyncQuota
 from app.models.rfp_project import RFPProject
 from datetime import datetime
+from typing import Iterable, Iterator
 from uuid import UUID
 
 RATE_LIMITS = {
@@ -26,8 +27,9 @@ class RateLimiter:
     
     @staticmethod
     def validate_document_content(text: str, page_count: int = None) -> tuple[bool, str]:
-        if page_count and page_count > MAX_DOCUMENT_PAGES:
-            return False, f"Document too long. Maximum {MAX_DOCUMENT_PAGES} pages allowed"
+        allowed, message = RateLimiter.validate_page_count(page_count)
+        if not allowed:
+            return False, message
         
         token_count = len(text.split())
         if token_count > MAX_DOCUMENT_TOKENS:
@@ -35,6 +37,21 @@ class RateLimiter:
         
         return True, ""
     
+    @staticmethod
+    def validate_page_count(page_count: int = None) -> tuple[bool, str]:
+        if page_count and page_count > MAX_DOCUMENT_PAGES:
+            return False, f"Document too long. Maximum {MAX_DOCUMENT_PAGES} pages allowed"
+        return True, ""
+    
+    @staticmethod
+    def enforce_word_limit(blocks: Iterable[str]) -> Iterator[str]:
+        token_count = 0
+        for block in blocks:
+            token_count += len(block.split())
+            if token_count > MAX_DOCUMENT_TOKENS:
+                raise ValueError(f"Document too large. Maximum {MAX_DOCUMENT_TOKENS} words allowed")
+            yield block
+    
     @staticmethod
     def check_document_quota(company_id: UUID, db: Session) -> tuple[bool, int, int]:
         quota = db.query(DocumentQuota).filter(
@@ -1,13 +1,17 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from difflib import SequenceMatcher
 import json
 import logging
+import re
 from app.services.llm_factory import LLMFactory
+from app.services.questionnaire_parser import QuestionnaireParser
+from app.services.pdf_extractor import PDFExtractor
 from app.prompts.question_extractor import (
     EXTRACT_QUESTIONS_SYSTEM,
     EXTRACT_QUESTIONS_USER,
 )
 from langchain_core.prompts import ChatPromptTemplate
-import pdfplumber
 from docx import Document as DocxDocument
 
 logger = logging.getLogger(__name__)
@@ -23,6 +27,20 @@ class RFPParser:
         r'^Question\s+\d+[:\.\)]\s*(.+)',
     ]
     
+    COMPILED_QUESTION_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in QUESTION_PATTERNS]
+    
+    STRUCTURE_SECTION_SIZE = 2000
+    STRUCTURE_CONFIDENCE_THRESHOLD = 0.8
+    STRUCTURE_MIN_ITEMS = 3
+    STRUCTURE_MAX_CONTINUATION_LINES = 2
+    
+    AI_WINDOW_SIZE = 15000
+    AI_WINDOW_OVERLAP = 1000
+    AI_MAX_WORKERS = 4
+    WINDOW_BOUNDARIES = ["\n--- Page", "\n\n", "\n"]
+    SEAM_DUPLICATE_THRESHOLD = 0.95
+    SEAM_POSITION_TOLERANCE = 200
+    
     QUESTION_KEYWORDS = [
         'describe', 'explain', 'what', 'how', 'why', 'when', 'where', 'who',
         'do you', 'does your', 'can you', 'will you', 'have you', 'are you',
@@ -31,8 +49,20 @@ class RFPParser:
         'tell us', 'give us', 'show us', 'supply', 'submit'
     ]
     
+    @staticmethod
+    def extract_question_items(file_path: str, file_type: str, question_column: Optional[str] = None) -> List[Dict]:
+        if QuestionnaireParser.is_supported(file_type):
+            questions = QuestionnaireParser.extract_questions(file_path, file_type, question_column)
+            logger.info(f"Read {len(questions)} questions from spreadsheet without AI extraction")
+            return questions
+        
+        return [{"text": text} for text in RFPParser.extract_questions(file_path, file_type)]
+    
     @staticmethod
     def extract_questions(file_path: str, file_type: str) -> List[str]:
+        if QuestionnaireParser.is_supported(file_type):
+            return [item["text"] for item in QuestionnaireParser.extract_questions(file_path, file_type)]
+        
         try:
             if file_type.endswith('.pdf'):
                 text = RFPParser._extract_pdf_text(file_path)
@@ -43,7 +73,7 @@ class RFPParser:
             else:
                 raise ValueError(f"Unsupported file type: {file_type}")
             
-            questions = RFPParser._ai_extract_questions(text)
+            questions = RFPParser._extract_from_text(text)
             
             if not questions or len(questions) == 0:
                 logger.warning("AI extraction returned no questions, falling back to regex")
@@ -57,14 +87,9 @@ class RFPParser:
     
     @staticmethod
     def _extract_pdf_text(file_path: str) -> str:
-        text = ""
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return text
+            pages = PDFExtractor.iter_pages(file_path, include_tables=False)
+            return "".join(page["text"] + "\n" for page in pages if page["text"])
         except Exception as e:
             logger.error(f"PDF extraction error: {str(e)}")
             raise ValueError(f"Failed to extract PDF: {str(e)}")
@@ -95,8 +120,211 @@ class RFPParser:
             logger.error(f"TXT extraction error: {str(e)}")
             raise ValueError(f"Failed to extract text: {str(e)}")
     
+    @staticmethod
+    def _extract_from_text(text: str) -> List[str]:
+        sections = RFPParser._split_windows(text, RFPParser.STRUCTURE_SECTION_SIZE, 0)
+        scored = [RFPParser._structured_extract(section_text) for _, section_text in sections]
+        
+        structured_questions = [question for items, _, _ in scored for question in items]
+        covered = sum(section_covered for _, section_covered, _ in scored)
+        total = sum(section_total for _, _, section_total in scored)
+        
+        if RFPParser._is_structured(structured_questions, covered, total):
+            logger.info(f"Structured pre-pass covered {covered / total:.0%} of the text, skipping AI extraction for {len(structured_questions)} questions")
+            return structured_questions
+        
+        questions = []
+        ai_run = []
+        ai_sections = 0
+        
+        for (_, section_text), (items, section_covered, section_total) in zip(sections, scored):
+            if RFPParser._is_structured(items, section_covered, section_total):
+                if ai_run:
+                    questions.extend(RFPParser._ai_extract_questions("".join(ai_run)))
+                    ai_run = []
+                questions.extend(items)
+            else:
+                ai_run.append(section_text)
+                ai_sections += 1
+        
+        if ai_run:
+            questions.extend(RFPParser._ai_extract_questions("".join(ai_run)))
+        
+        logger.info(f"Sent {ai_sections} of {len(sections)} sections to AI extraction")
+        return questions
+    
+    @staticmethod
+    def _is_structured(questions: List[str], covered: int, total: int) -> bool:
+        return (
+            total > 0
+            and len(questions) >= RFPParser.STRUCTURE_MIN_ITEMS
+            and covered / total >= RFPParser.STRUCTURE_CONFIDENCE_THRESHOLD
+        )
+    
+    @staticmethod
+    def _structured_extract(text: str) -> Tuple[List[str], int, int]:
+        questions = []
+        covered = 0
+        total = 0
+        current_question = None
+        continuation_lines = 0
+        
+        for line in text.split('\n'):
+            line = line.strip()
+            
+            if len(line) < 10:
+                continue
+            
+            total += len(line)
+            numbered = RFPParser._match_question_pattern(line)
+            candidate = numbered if numbered is not None else line
+            
+            if candidate.endswith('?') or (numbered is not None and RFPParser._starts_with_keyword(candidate)):
+                if current_question:
+                    questions.append(current_question)
+                current_question = candidate
+                continuation_lines = 0
+                covered += len(line)
+            elif (
+                numbered is None
+                and current_question
+                and not current_question.endswith('?')
+                and continuation_lines < RFPParser.STRUCTURE_MAX_CONTINUATION_LINES
+            ):
+                current_question += ' ' + line
+                continuation_lines += 1
+                covered += len(line)
+            elif current_question:
+                questions.append(current_question)
+                current_question = None
+        
+        if current_question:
+            questions.append(current_question)
+        
+        return [q for q in questions if len(q) >= 15], covered, total
+    
+    @staticmethod
+    def _match_question_pattern(line: str) -> Optional[str]:
+        for pattern in RFPParser.COMPILED_QUESTION_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                return match.group(1).strip()
+        return None
+    
+    @staticmethod
+    def _starts_with_keyword(text: str) -> bool:
+        text_lower = text.lower()
+        return any(text_lower.startswith(keyword) for keyword in RFPParser.QUESTION_KEYWORDS)
+    
     @staticmethod
     def _ai_extract_questions(text: str) -> List[str]:
+        if len(text) <= RFPParser.AI_WINDOW_SIZE:
+            return RFPParser._ai_extract_window(text)
+        
+        windows = RFPParser._split_windows(text, RFPParser.AI_WINDOW_SIZE, RFPParser.AI_WINDOW_OVERLAP)
+        logger.info(f"Extracting questions from {len(windows)} windows of {len(text)} characters")
+        
+        window_questions = [[] for _ in windows]
+        with ThreadPoolExecutor(max_workers=min(RFPParser.AI_MAX_WORKERS, len(windows))) as executor:
+            futures = {
+                executor.submit(RFPParser._ai_extract_window, window_text): i
+                for i, (_, window_text) in enumerate(windows)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    window_questions[i] = future.result()
+                except Exception as e:
+                    logger.error(f"AI extraction failed for window {i + 1}, using fallback: {str(e)}")
+                    window_questions[i] = RFPParser._fallback_extract(windows[i][1])
+        
+        window_items = []
+        for (start, window_text), questions in zip(windows, window_questions):
+            window_lower = window_text.lower()
+            cursor = 0
+            items = []
+            for question in questions:
+                offset = window_lower.find(question[:40].lower(), cursor)
+                located = offset != -1
+                if located:
+                    cursor = offset
+                items.append((start + cursor, question, RFPParser._normalize_question(question), located))
+            window_items.append(items)
+        
+        questions = RFPParser._merge_window_questions(window_items, windows)
+        
+        logger.info(f"AI extracted {len(questions)} questions across {len(windows)} windows")
+        return questions
+    
+    @staticmethod
+    def _split_windows(text: str, size: int, overlap: int) -> List[Tuple[int, str]]:
+        windows = []
+        start = 0
+        
+        while start < len(text):
+            end = min(start + size, len(text))
+            
+            if end < len(text):
+                min_end = start + size // 2
+                for boundary in RFPParser.WINDOW_BOUNDARIES:
+                    cut = text.rfind(boundary, min_end, end)
+                    if cut != -1:
+                        end = cut + 1
+                        break
+            
+            windows.append((start, text[start:end]))
+            
+            if end >= len(text):
+                break
+            start = max(end - overlap, start + 1)
+        
+        return windows
+    
+    @staticmethod
+    def _merge_window_questions(window_items: List[List[Tuple[int, str, str, bool]]], windows: List[Tuple[int, str]]) -> List[str]:
+        merged = []
+        
+        for window_index, items in enumerate(window_items):
+            if window_index > 0:
+                window_start = windows[window_index][0]
+                previous_start, previous_text = windows[window_index - 1]
+                previous_end = previous_start + len(previous_text)
+                previous_seam = [item for item in window_items[window_index - 1] if item[0] >= window_start - RFPParser.SEAM_POSITION_TOLERANCE]
+                
+                items = [
+                    item for item in items
+                    if item[0] >= previous_end or not RFPParser._is_seam_duplicate(item, previous_seam)
+                ]
+                window_items[window_index] = items
+            
+            merged.extend((position, window_index, question) for position, question, _, _ in items)
+        
+        merged.sort(key=lambda item: (item[0], item[1]))
+        return [question for _, _, question in merged]
+    
+    @staticmethod
+    def _is_seam_duplicate(item: Tuple[int, str, str, bool], previous_seam: List[Tuple[int, str, str, bool]]) -> bool:
+        position, _, normalized, located = item
+        
+        for previous_position, _, previous_normalized, previous_located in previous_seam:
+            fuzzy = located and previous_located and abs(position - previous_position) <= RFPParser.SEAM_POSITION_TOLERANCE
+            if RFPParser._is_near_duplicate(normalized, previous_normalized, fuzzy):
+                return True
+        
+        return False
+    
+    @staticmethod
+    def _is_near_duplicate(a: str, b: str, fuzzy: bool) -> bool:
+        if a in b or b in a:
+            return True
+        return fuzzy and SequenceMatcher(None, a, b).ratio() >= RFPParser.SEAM_DUPLICATE_THRESHOLD
+    
+    @staticmethod
+    def _normalize_question(question: str) -> str:
+        return re.sub(r'[^a-z0-9]+', ' ', question.lower()).strip()
+    
+    @staticmethod
+    def _ai_extract_window(text: str) -> List[str]:
         try:
             llm = LLMFactory.get_llm("gemini-2.0-flash", temperature=0)
             
@@ -107,9 +335,6 @@ class RFPParser:
             
             chain = prompt | llm
             
-            if len(text) > 50000:
-                text = text[:50000]
-            
             response = chain.invoke({"text": text})
             
             content = response.content.strip()
@@ -127,7 +352,7 @@ class RFPParser:
             
             logger.info(f"AI extracted {len(questions)} questions")
             return questions
-            
+        
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error in AI extraction: {str(e)}")
             raise
@@ -137,8 +362,6 @@ class RFPParser:
     
     @staticmethod
     def _fallback_extract(text: str) -> List[str]:
-        import re
-        
         questions = []
         lines = text.split('\n')
         
@@ -157,18 +380,13 @@ class RFPParser:
             if line.endswith('?'):
                 is_question = True
             
-            for pattern in RFPParser.QUESTION_PATTERNS:
-                match = re.match(pattern, line, re.IGNORECASE)
-                if match:
-                    is_question = True
-                    if match.groups():
-                        question_text = match.group(1).strip()
-                    break
-            
-            if not is_question:
-                line_lower = line.lower()
-                if any(line_lower.startswith(keyword) for keyword in RFPParser.QUESTION_KEYWORDS):
-                    is_question = True
+            numbered = RFPParser._match_question_pattern(line)
+            if numbered is not None:
+                is_question = True
+                question_text = numbered
+            
+            if not is_question and RFPParser._starts_with_keyword(line):
+                is_question = True
             
             if is_question:
                 if current_question and len(current_question) < 500:
@@ -5,8 +5,11 @@ from app.models.attribute import Attribute
 from app.models.resync_quota import ResyncQuota
 from app.services.document_processor import DocumentProcessor
 from app.services.attribute_extractor import AttributeExtractor
+from app.services.attribute_search import AttributeSearchService
+from app.services.attribute_snapshot import attribute_snapshot_cache
 from app.agents.kb_manager import run_kb_manager
 from datetime import datetime
+from uuid import UUID
 import httpx
 import tempfile
 import os
@@ -24,6 +27,7 @@ def resync_attributes_task(user_id: str, company_id: str):
             Attribute.company_id == company_id
         ).delete()
         db.commit()
+        attribute_snapshot_cache.invalidate(company_id)
         
         documents = db.query(Document).filter(
             Document.user_id == user_id,
@@ -93,5 +97,20 @@ def resync_attributes_task(user_id: str, company_id: str):
         logger.error(f"Resync error: {str(e)}")
         return {"error": str(e)}
     
+    finally:
+        db.close()
+
+@celery_app.task(name="backfill_attribute_embeddings")
+def backfill_attribute_embeddings_task(company_id: str = None):
+    db = SessionLocal()
+    
+    try:
+        total = AttributeSearchService.backfill_embeddings(db, UUID(company_id) if company_id else None)
+        return {"status": "completed", "attributes_embedded": total}
+    
+    except Exception as e:
+        logger.error(f"Attribute embedding backfill error: {str(e)}")
+        return {"error": str(e)}
+    
     finally:
         db.close()
\ No newline at end of file
@@ -10,7 +10,8 @@ celery_app = Celery(
     backend=settings.REDIS_URL,
     include=[
         'app.workers.tasks',
-        'app.workers.rfp_tasks'
+        'app.workers.rfp_tasks',
+        'app.workers.attribute_tasks'
     ]
 )
 
@@ -1,15 +1,26 @@
 from app.workers.celery_app import celery_app
+from app.core.config import get_settings
 from app.core.database import SessionLocal
 from app.models.rfp_project import RFPProject, RFPStatus
-from app.models.rfp_question import RFPQuestion
+from app.models.rfp_question import RFPQuestion, QuestionStatus
 from app.services.rfp_parser import RFPParser
 from app.agents.answer_generator import generate_answer_for_question
+from celery import chord, group
+from celery.exceptions import Retry
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+from typing import List, Dict
+from datetime import datetime
 import httpx
 import tempfile
 import os
+import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from uuid import UUID
 
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
 def process_single_question(question_text: str, rfp_id: str, user_id: str, company_id: str):
     db = SessionLocal()
     try:
@@ -23,10 +34,104 @@ def process_single_question(question_text: str, rfp_id: str, user_id: str, compa
     finally:
         db.close()
 
-@celery_app.task(name="process_rfp")
-def process_rfp_task(rfp_id: str):
+def answer_questions(db: Session, questions: List[Dict], rfp_id: str, user_id: str, company_id: str) -> int:
+    pending = []
+    saved = 0
+    
+    with ThreadPoolExecutor(max_workers=settings.RFP_QUESTION_CONCURRENCY) as executor:
+        futures = {executor.submit(process_single_question, q["text"], rfp_id, user_id, company_id): q for q in questions}
+        for future in as_completed(futures):
+            question = futures[future]
+            try:
+                result = future.result()
+                result["status"] = QuestionStatus.ANSWERED
+            except Exception as e:
+                result = {
+                    "question": question["text"],
+                    "answer": f"Error generating answer: {str(e)}",
+                    "trust_score": 0.0,
+                    "source_type": "error",
+                    "status": QuestionStatus.FAILED
+                }
+            result["id"] = question["id"]
+            pending.append(result)
+            
+            if len(pending) >= settings.RFP_SAVE_BATCH_SIZE:
+                saved += save_question_results(db, UUID(rfp_id), pending)
+                pending = []
+    
+    if pending:
+        saved += save_question_results(db, UUID(rfp_id), pending)
+    
+    return saved
+
+def save_question_results(db: Session, rfp_id: UUID, results: List[Dict]) -> int:
+    now = datetime.utcnow()
+    db.execute(update(RFPQuestion), [
+        {
+            "id": UUID(result["id"]),
+            "answer_text": result["answer"],
+            "trust_score": result["trust_score"],
+            "source_type": result.get("source_type", "rag"),
+            "status": result["status"],
+            "updated_at": now
+        }
+        for result in results
+    ])
+    db.execute(
+        update(RFPProject)
+        .where(RFPProject.id == rfp_id)
+        .values(questions_processed=RFPProject.questions_processed + len(results))
+    )
+    db.commit()
+    
+    logger.info(f"Saved {len(results)} answers for RFP {rfp_id}")
+    return len(results)
+
+def load_or_extract_questions(db: Session, rfp: RFPProject) -> List[RFPQuestion]:
+    questions = db.query(RFPQuestion).filter(
+        RFPQuestion.project_id == rfp.id
+    ).order_by(RFPQuestion.question_index).all()
+    
+    if questions:
+        logger.info(f"Resuming RFP {rfp.id} from {len(questions)} checkpointed questions")
+        return questions
+    
+    response = httpx.get(rfp.rfp_file_url)
+    filename = rfp.rfp_file_url.split('/')[-1]
+    
+    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as tmp_file:
+        tmp_file.write(response.content)
+        tmp_path = tmp_file.name
+    
+    question_items = RFPParser.extract_question_items(tmp_path, filename, rfp.question_column)
+    os.unlink(tmp_path)
+    
+    if question_items:
+        db.execute(insert(RFPQuestion), [
+            {
+                "project_id": rfp.id,
+                "question_index": i,
+                "question_text": item["text"],
+                "source_sheet": item.get("sheet"),
+                "source_row": item.get("row"),
+                "status": QuestionStatus.PENDING,
+                "user_edited": False
+            }
+            for i, item in enumerate(question_items)
+        ])
+    
+    rfp.questions_total = len(question_items)
+    db.commit()
+    
+    return db.query(RFPQuestion).filter(
+        RFPQuestion.project_id == rfp.id
+    ).order_by(RFPQuestion.question_index).all()
+
+@celery_app.task(name="process_rfp", bind=True, max_retries=settings.RFP_MAX_RETRIES)
+def process_rfp_task(self, rfp_id: str):
     db = SessionLocal()
-    rfp = None 
+    rfp = None
     
     try:
         rfp = db.query(RFPProject).filter(RFPProject.id == rfp_id).first()
@@ -36,53 +141,115 @@ def process_rfp_task(rfp_id: str):
         rfp.status = RFPStatus.PROCESSING
         db.commit()
         
-        response = httpx.get(rfp.rfp_file_url)
+        questions = load_or_extract_questions(db, rfp)
+        pending = [
+            {"id": str(q.id), "text": q.question_text}
+            for q in questions
+            if q.status != QuestionStatus.ANSWERED
+        ]
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(rfp.rfp_name)[1]) as tmp_file:
-            tmp_file.write(response.content)
-            tmp_path = tmp_file.name
+        rfp.questions_total = len(questions)
+        rfp.questions_processed = len(questions) - len(pending)
+        db.commit()
         
-        filename = rfp.rfp_file_url.split('/')[-1]
-        questions = RFPParser.extract_questions(tmp_path, filename)
-        os.unlink(tmp_path)
+        if settings.RFP_EXECUTION_MODE == "distributed" and pending:
+            return _dispatch_question_batches(rfp, pending)
         
-        results = []
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {executor.submit(process_single_question, q, str(rfp.id), str(rfp.user_id), str(rfp.company_id)): q for q in questions}
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
-                    question = futures[future]
-                    results.append({
-                        "question": question,
-                        "answer": f"Error generating answer: {str(e)}",
-                        "trust_score": 0.0,
-                        "source_type": "error"
-                    })
+        answer_questions(db, pending, str(rfp.id), str(rfp.user_id), str(rfp.company_id))
         
-        for result in results:
-            rfp_question = RFPQuestion(
-                project_id=rfp.id,
-                question_text=result["question"],
-                answer_text=result["answer"],
-                trust_score=result["trust_score"],
-                source_type=result.get("source_type", "rag"),
-                user_edited=False
-            )
-            db.add(rfp_question)
+        failed_count = db.query(RFPQuestion).filter(
+            RFPQuestion.project_id == rfp.id,
+            RFPQuestion.status == QuestionStatus.FAILED
+        ).count()
+        
+        if failed_count and self.request.retries < self.max_retries:
+            logger.warning(f"{failed_count} questions failed for RFP {rfp_id}, retrying")
+            raise self.retry(countdown=settings.RFP_RETRY_DELAY_SECONDS)
         
         rfp.status = RFPStatus.COMPLETED
         db.commit()
         
-        return {"status": "completed", "rfp_id": str(rfp_id), "questions_count": len(questions)}
+        return {"status": "completed", "rfp_id": str(rfp_id), "questions_count": len(questions), "failed_count": failed_count}
+    
+    except Retry:
+        raise
     
     except Exception as e:
+        db.rollback()
+        if rfp and self.request.retries < self.max_retries:
+            logger.warning(f"Error processing RFP {rfp_id}, retrying: {str(e)}")
+            raise self.retry(exc=e, countdown=settings.RFP_RETRY_DELAY_SECONDS)
         if rfp:
             rfp.status = RFPStatus.FAILED
             db.commit()
         return {"error": str(e)}
     
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def _dispatch_question_batches(rfp: RFPProject, questions: List[Dict], attempt: int = 0, countdown: int = 0) -> Dict:
+    batch_size = max(settings.RFP_QUESTION_BATCH_SIZE, 1)
+    batches = [questions[i:i + batch_size] for i in range(0, len(questions), batch_size)]
+    
+    header = group(
+        answer_rfp_questions_task.s(str(rfp.id), str(rfp.user_id), str(rfp.company_id), batch).set(countdown=countdown)
+        for batch in batches
+    )
+    callback = finalize_rfp_task.s(str(rfp.id), attempt).on_error(fail_rfp_task.si(str(rfp.id)))
+    chord(header)(callback)
+    
+    logger.info(f"Dispatched {len(questions)} questions for RFP {rfp.id} in {len(batches)} batches (attempt {attempt + 1})")
+    
+    return {"status": "dispatched", "rfp_id": str(rfp.id), "questions_count": len(questions), "batches": len(batches)}
+
+@celery_app.task(name="answer_rfp_questions")
+def answer_rfp_questions_task(rfp_id: str, user_id: str, company_id: str, questions: List[Dict]):
+    db = SessionLocal()
+    try:
+        return answer_questions(db, questions, rfp_id, user_id, company_id)
+    finally:
+        db.close()
+
+@celery_app.task(name="finalize_rfp")
+def finalize_rfp_task(batch_counts: List[int], rfp_id: str, attempt: int = 0):
+    db = SessionLocal()
+    try:
+        rfp = db.query(RFPProject).filter(RFPProject.id == rfp_id).first()
+        if not rfp:
+            return {"error": "RFP not found"}
+        
+        failed = db.query(RFPQuestion).filter(
+            RFPQuestion.project_id == rfp.id,
+            RFPQuestion.status == QuestionStatus.FAILED
+        ).order_by(RFPQuestion.question_index).all()
+        
+        if failed and attempt < settings.RFP_MAX_RETRIES:
+            logger.warning(f"{len(failed)} questions failed for RFP {rfp_id}, retrying")
+            rfp.questions_processed = rfp.questions_total - len(failed)
+            db.commit()
+            
+            return _dispatch_question_batches(
+                rfp,
+                [{"id": str(q.id), "text": q.question_text} for q in failed],
+                attempt=attempt + 1,
+                countdown=settings.RFP_RETRY_DELAY_SECONDS
+            )
+        
+        rfp.status = RFPStatus.COMPLETED
+        db.commit()
+        
+        return {"status": "completed", "rfp_id": rfp_id, "questions_count": sum(batch_counts), "failed_count": len(failed)}
+    finally:
+        db.close()
+
+@celery_app.task(name="fail_rfp")
+def fail_rfp_task(rfp_id: str):
+    db = SessionLocal()
+    try:
+        rfp = db.query(RFPProject).filter(RFPProject.id == rfp_id).first()
+        if rfp:
+            rfp.status = RFPStatus.FAILED
+            db.commit()
+        logger.error(f"Distributed processing failed for RFP {rfp_id}")
+    finally:
+        db.close()
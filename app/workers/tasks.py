@@ -1,11 +1,16 @@
 from app.workers.celery_app import celery_app
 from app.core.database import SessionLocal
 from app.models.document import Document, ProcessingStatus
-from app.models.vector_chunk import VectorChunk as DocumentChunk
 from app.services.document_processor import DocumentProcessor
 from app.services.embedding_service import EmbeddingService
+from app.services.chunk_writer import ChunkWriter
 from app.services.attribute_extractor import AttributeExtractor
+from app.services.rag_service import RAGService
+from app.services.document_dedup import DocumentDeduplicator
 from app.agents.kb_manager import run_kb_manager
+from sqlalchemy.orm import Session
+from typing import List, Dict
+from uuid import UUID
 import httpx
 import tempfile
 import os
@@ -26,34 +31,46 @@ def process_document_task(document_id: str):
         document.processing_status = ProcessingStatus.PROCESSING
         db.commit()
         
+        duplicate = DocumentDeduplicator.find_completed_duplicate(db, document.company_id, document.content_hash, exclude_id=document.id)
+        if duplicate:
+            chunks_count = DocumentDeduplicator.clone_chunks(db, duplicate, document)
+            document.processing_status = ProcessingStatus.COMPLETED
+            db.commit()
+            RAGService.invalidate_company_index(document.company_id)
+            
+            return {
+                "status": "completed",
+                "document_id": str(document_id),
+                "chunks_count": chunks_count,
+                "duplicate_of": str(duplicate.id)
+            }
+        
         response = httpx.get(document.file_url)
         
         with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(document.filename)[1]) as tmp_file:
             tmp_file.write(response.content)
             tmp_path = tmp_file.name
         
-        text_content = DocumentProcessor.extract_text(tmp_path, document.filename)
-        os.unlink(tmp_path)
-        
-        chunks = DocumentProcessor.chunk_text(text_content)
-        
-        chunk_texts = [chunk["text"] for chunk in chunks]
-        embeddings = EmbeddingService.generate_embeddings(chunk_texts)
-        
-        for i, chunk in enumerate(chunks):
-            doc_chunk = DocumentChunk(
-                doc_id=document.id,
-                chunk_index=i,
-                chunk_text=chunk["text"],
-                embedding=embeddings[i],
-                chunk_metadata=chunk["metadata"]
-            )
-            db.add(doc_chunk)
+        chunk_texts = []
+        try:
+            batch = []
+            for chunk in DocumentProcessor.chunk_blocks(DocumentProcessor.stream_text(tmp_path, document.filename, enforce_limits=True)):
+                batch.append(chunk)
+                chunk_texts.append(chunk["text"])
+                
+                if len(batch) >= ChunkWriter.INSERT_BATCH_SIZE:
+                    _embed_and_insert(db, document.id, batch)
+                    batch = []
+            
+            _embed_and_insert(db, document.id, batch)
+        finally:
+            os.unlink(tmp_path)
         
         db.commit()
+        RAGService.invalidate_company_index(document.company_id)
         
         logger.info(f"Extracting attributes from document {document.id}")
-        attributes = AttributeExtractor.extract_attributes(text_content)
+        attributes = AttributeExtractor.extract_attributes_from_chunks(chunk_texts)
         logger.info(f"Extracted {len(attributes)} raw attributes")
         
         if attributes:
@@ -78,7 +95,7 @@ def process_document_task(document_id: str):
         return {
             "status": "completed",
             "document_id": str(document_id),
-            "chunks_count": len(chunks),
+            "chunks_count": len(chunk_texts),
             "attributes_stats": kb_stats
         }
     
@@ -91,4 +108,12 @@ def process_document_task(document_id: str):
         return {"error": str(e)}
     
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def _embed_and_insert(db: Session, doc_id: UUID, chunks: List[Dict]):
+    if not chunks:
+        return
+    
+    embeddings = EmbeddingService.generate_embeddings([chunk["text"] for chunk in chunks])
+    ChunkWriter.bulk_insert(db, doc_id, chunks, embeddings)
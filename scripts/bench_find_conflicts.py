@@ -0,0 +1,115 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.agents.kb_manager.nodes import find_conflicts as fc
+
+WORDS = [
+    "soc", "type", "report", "compliance", "encryption", "rest", "transit", "data", "retention",
+    "policy", "uptime", "sla", "support", "hours", "headquarters", "location", "employee", "count",
+    "iso", "certification", "gdpr", "hipaa", "backup", "frequency", "mfa", "sso", "provider", "api",
+    "rate", "limit", "region", "hosting", "disaster", "recovery", "rto", "rpo", "pricing", "tier",
+    "contract", "term", "insurance", "coverage", "audit", "penetration", "test", "vendor", "risk",
+    "incident", "response", "time", "logging", "access", "review", "password", "rotation", "founded",
+    "year", "customer", "industry", "integration", "platform", "deployment", "model", "language"
+]
+CATEGORIES = ["technical", "compliance", "business", "product"]
+
+
+def make_key(rng: random.Random) -> str:
+    return " ".join(rng.sample(WORDS, rng.randint(2, 4))).title()
+
+
+def make_value(rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(3, 12)))
+
+
+def vary(key: str, rng: random.Random) -> str:
+    variant = rng.choice([key.lower(), key.upper(), key.replace(" ", "_"), key + "s", key.replace(" ", " - ")])
+    if rng.random() < 0.3 and len(variant) > 6:
+        i = rng.randrange(len(variant))
+        variant = variant[:i] + variant[i + 1:]
+    if rng.random() < 0.2:
+        words = variant.split()
+        variant = " ".join(words[:2])
+        i = rng.randrange(len(variant))
+        variant = variant[:i] + rng.choice("aeiost") + variant[i + 1:]
+    return variant
+
+
+def make_state(existing_count: int, new_count: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    existing = [
+        {"id": str(i), "key": make_key(rng), "value": make_value(rng), "category": rng.choice(CATEGORIES)}
+        for i in range(existing_count)
+    ]
+
+    new = []
+    for _ in range(new_count):
+        if rng.random() < 0.5:
+            source = rng.choice(existing)
+            value = source["value"] if rng.random() < 0.5 else make_value(rng)
+            new.append({"key": vary(source["key"], rng), "value": value, "category": source["category"]})
+        else:
+            new.append({"key": make_key(rng), "value": make_value(rng), "category": rng.choice(CATEGORIES)})
+
+    return {"new_attributes": new, "existing_attributes": existing}
+
+
+def brute_force_conflicts(state: dict) -> dict:
+    matches = {}
+    for new_attr in fc._deduplicate_new_attributes(state["new_attributes"]):
+        best_match = None
+        best_score = 0
+        for existing_attr in state["existing_attributes"]:
+            key_similarity = fc._calculate_key_similarity(new_attr["key"], existing_attr["key"])
+            if key_similarity > 0.75:
+                value_similarity = fc._calculate_value_similarity(new_attr["value"], existing_attr["value"])
+                category_match = new_attr["category"] == existing_attr["category"]
+                score = key_similarity * 0.6 + value_similarity * 0.3 + (1.0 if category_match else 0.0) * 0.1
+                if score > best_score:
+                    best_score = score
+                    best_match = existing_attr
+        if best_match and best_score > 0.7:
+            matches[new_attr["key"]] = best_match["id"]
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark KB-manager conflict detection")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--new", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline-max", type=int, default=10000,
+                        help="largest existing-attribute count to also run the brute-force scan on")
+    args = parser.parse_args()
+
+    print(f"{'existing':>9} {'indexed_s':>10} {'conflicts':>10} {'brute_s':>9} {'speedup':>8} {'agreement':>10}")
+
+    for size in args.sizes:
+        state = make_state(size, args.new, args.seed)
+
+        start = time.perf_counter()
+        result = fc.find_conflicts(dict(state))
+        indexed = time.perf_counter() - start
+
+        found = {c["new"]["key"]: c["existing"]["id"] for c in result["conflicts"]}
+
+        if size > args.baseline_max:
+            print(f"{size:>9} {indexed:>10.3f} {len(found):>10} {'-':>9} {'-':>8} {'-':>10}")
+            continue
+
+        start = time.perf_counter()
+        expected = brute_force_conflicts(state)
+        brute = time.perf_counter() - start
+
+        agreement = sum(1 for key, match in expected.items() if found.get(key) == match) / max(len(expected), 1)
+        print(f"{size:>9} {indexed:>10.3f} {len(found):>10} {brute:>9.3f} {brute / indexed:>7.1f}x {agreement:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()